@@ -3,7 +3,7 @@ MariolaMLCryptoTradingUtils - DataFrame Calculation
 
 This script provides functionality for calculating technical analysis parameters
 from historical cryptocurrency data fetched via Binance API.
-The script processes a CSV file with historical klines data and saves
+The script processes a Parquet (or CSV) file with historical klines data and saves
 the processed DataFrame with additional parameters based on user-defined settings.
 
 Functions:
@@ -13,15 +13,15 @@ Requirements:
     - logger_utils: Functions for initializing and using a logger.
     - parser_utils: Functions for parsing command-line arguments.
     - df_utils: Function for preparing DataFrame (prepare_df).
-    - app_utils: Helper functions for extracting settings and handling CSV files.
+    - app_utils: Helper functions for extracting settings and handling data files.
 
 Usage:
     Run the script with two arguments:
     1. JSON settings file containing configuration for regression and classification.
-    2. CSV file with historical klines data to process.
+    2. Parquet (or CSV) file with historical klines data to process.
 
     Example:
-        python calculate_df.py settings.json historical_data.csv
+        python calculate_df.py settings.json df_btc_1h_fetched.parquet
 
 Author:
     PedroMolina
@@ -37,11 +37,17 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from utils.logger_utils import initialize_logger, log
 from utils.parser_utils import get_parsed_arguments
-from utils.df_utils import prepare_ml_df
+from utils.df_utils import (
+    prepare_ml_df,
+    OHLCV_DTYPES,
+    DF_FEATURES_VERSION,
+    DF_SETTINGS_KEYS,
+)
+from utils.cache_utils import get_df_cache_key, load_cached_df, save_df_to_cache
 from utils.app_utils import (
     extract_settings_data,
-    load_data_from_csv,
-    save_data_to_csv,
+    load_data,
+    save_data,
     save_df_info,
 )
 
@@ -54,9 +60,14 @@ def calculate_df():
         1. Parse command-line arguments to get the settings file and data file.
         2. Initialize the logger using the settings file.
         3. Extract settings data from the provided JSON settings file, including configuration for regression and classification.
-        4. Load historical klines data from the specified CSV file.
+        4. Load historical klines data from the specified data file.
         5. Process the data using the `prepare_df` function to calculate regression or classification parameters based on the settings.
-        6. Save the processed DataFrame to a new CSV file and generate an info file.
+           The result is cached on disk, keyed by the data file contents, the settings read by
+           prepare_ml_df (DF_SETTINGS_KEYS) and the df_utils source (DF_FEATURES_VERSION), so steps 4-5 are skipped when none of them
+           has changed since the last run. Only the DF_CACHE_MAX_ENTRIES most recently used
+           results are kept in the cache.
+        6. Save the processed DataFrame to a new Parquet file and generate an info file
+           (unless the optional "write_info_files" setting is false).
         7. Log the completion of the process and the total time taken.
 
     Arguments:
@@ -64,22 +75,22 @@ def calculate_df():
 
     Command-line Arguments:
         - First argument: The path to the JSON settings file.
-        - Second argument: The path to the CSV file containing historical klines data.
+        - Second argument: The path to the Parquet (or CSV) file containing historical klines data.
 
     Returns:
-        None. This function saves the calculated DataFrame to a CSV file and generates an info file.
+        None. This function saves the calculated DataFrame to a Parquet file and generates an info file.
 
     Raises:
         Exception: If any step in the data processing pipeline fails, the error is logged.
 
     Example:
-        python calculate_df.py settings.json historical_data.csv
+        python calculate_df.py settings.json df_btc_1h_fetched.parquet
     """
     start_time = time()
 
     settings_filename, data_filename = get_parsed_arguments(
         first_arg_string="Settings filename.json",
-        second_arg_string="Klines full historical data filename.csv",
+        second_arg_string="Klines full historical data filename (.parquet or .csv)",
     )
 
     initialize_logger(settings_filename)
@@ -92,38 +103,52 @@ def calculate_df():
     settings = settings_data["settings"]
     regression = settings_data["settings"]["regression"]
     classification = settings_data["settings"]["classification"]
+    write_info_files = settings_data["settings"].get("write_info_files", True)
 
-    log(
-        f"Load data from csv file.\n"
-        f"Starting load_data_from_csv.\n"
-        f"Filename: {data_filename}"
+    cache_key = get_df_cache_key(
+        data_filename, settings, DF_FEATURES_VERSION, DF_SETTINGS_KEYS
     )
-    data_df = load_data_from_csv(data_filename)
-    log(f"load_data_from_csv completed.")
-
-    log(
-        f"Prepare DataFrame.\n"
-        f"Starting prepare_df.\n"
-        f"Regression: {regression}\n"
-        f"Classification: {classification}"
-    )
-    result_df = prepare_ml_df(
-        df=data_df,
-        regression=regression,
-        classification=classification,
-        settings=settings,
-        training_mode=True,
-    )
-
-    csv_filename = data_filename.replace("_fetched", "_calculated")
-    info_filename = csv_filename.replace("csv", "info")
-    save_data_to_csv(result_df, csv_filename)
-    save_df_info(result_df, info_filename)
+    if cache_key is None:
+        log(f"Error. Cannot read data file {data_filename}. Calculation aborted.")
+        return None
+
+    result_df = load_cached_df(cache_key)
+
+    if result_df is None:
+        log(
+            f"Load data from file.\n"
+            f"Starting load_data.\n"
+            f"Filename: {data_filename}"
+        )
+        data_df = load_data(data_filename, dtype=OHLCV_DTYPES)
+        log(f"load_data completed.")
+
+        log(
+            f"Prepare DataFrame.\n"
+            f"Starting prepare_df.\n"
+            f"Regression: {regression}\n"
+            f"Classification: {classification}"
+        )
+        result_df = prepare_ml_df(
+            df=data_df,
+            regression=regression,
+            classification=classification,
+            settings=settings,
+            training_mode=True,
+        )
+        save_df_to_cache(result_df, cache_key)
+
+    calculated_filename = Path(data_filename.replace("_fetched", "_calculated"))
+    calculated_data_filename = str(calculated_filename.with_suffix(".parquet"))
+    info_filename = str(calculated_filename.with_suffix(".info"))
+    save_data(result_df, calculated_data_filename)
+    if write_info_files:
+        save_df_info(result_df, info_filename)
 
     end_time = time()
     log(
         f"Calculating Technical Analysis parameters completed.\n"
-        f"prepare_df completed and result_df saved to {csv_filename}.\n"
+        f"prepare_df completed and result_df saved to {calculated_data_filename}.\n"
         f"{'Regression' if regression else 'Classification'}\n"
         f"Time taken: {end_time - start_time:.2f} seconds"
     )
@@ -2,10 +2,11 @@
 MariolaMLCryptoTradingUtils - Fetching Historical Data
 
 This script is responsible for fetching historical cryptocurrency data from an API,
-saving it as CSV files, and logging the process. The script uses a settings file to define
+saving it as Parquet files, and logging the process. The script uses a settings file to define
 a sequence of data fetch steps and supports a dry run mode for testing.
 
 Functions:
+    fetch_and_save_step() - Fetches and saves historical data for a single step.
     fetch_data() - Main function for fetching historical cryptocurrency data.
 
 Requirements:
@@ -29,14 +30,78 @@ Last Update:
 """
 
 import sys
+import threading
 from time import time
 from pathlib import Path
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from utils.parser_utils import get_parsed_arguments
 from utils.logger_utils import initialize_logger, log
-from utils.api_utils import get_full_historical_klines
-from utils.app_utils import extract_settings_data, save_data_to_csv, save_df_info
+from utils.api_utils import get_cached_historical_klines
+from utils.app_utils import extract_settings_data, save_data, save_df_info
+
+
+MAX_CONCURRENT_STEPS = 4
+
+
+def fetch_and_save_step(
+    step_name: str,
+    value: dict,
+    write_info_file: bool = True,
+    cache_lock: Optional[threading.Lock] = None,
+) -> bool:
+    """
+    Fetches historical klines for a single fetch sequence step and saves them.
+
+    The klines are saved as zstd-compressed Parquet to
+    'mariola/data/df_<step_name>_fetched.parquet' together with
+    an info file (unless write_info_file is False).
+    Errors during fetching are logged and the step is skipped.
+
+    Arguments:
+        step_name (str): The name of the step, used in the output filenames.
+        value (dict): The step settings with 'symbol', 'interval' and 'start_str' keys.
+        write_info_file (bool): Whether to save the info file next to the data file.
+        cache_lock (threading.Lock, optional): A lock held while the klines cache of
+                                               the step's symbol and interval is used.
+
+    Returns:
+        bool: True if the klines were fetched and saved, False if the step was skipped.
+    """
+    symbol = str(value["symbol"])
+    interval = str(value["interval"])
+    start_str = str(value["start_str"])
+
+    log(
+        f"Fetching data.\n"
+        f"step_name: {step_name}\n"
+        f"symbol: {symbol}\n"
+        f"interval: {interval}"
+    )
+
+    try:
+        with cache_lock or nullcontext():
+            historical_klines = get_cached_historical_klines(
+                symbol=symbol, interval=interval, start_str=start_str
+            )
+    except Exception as e:
+        log(f"Error during data fetching for step {step_name}: {e}")
+        return False
+
+    if historical_klines is None:
+        log(f"Error during data fetching for step {step_name}. No klines fetched.")
+        return False
+
+    data_filename = f"mariola/data/df_{step_name}_fetched.parquet"
+    info_filename = str(Path(data_filename).with_suffix(".info"))
+    save_data(historical_klines, data_filename)
+    if write_info_file:
+        save_df_info(historical_klines, info_filename)
+    log(f"historical_klines saved to {data_filename}.")
+    return True
 
 
 def fetch_data():
@@ -46,9 +111,17 @@ def fetch_data():
     The function performs the following steps:
         1. Parses command-line arguments to retrieve the settings filename and dry run mode.
         2. Initializes logging and extracts settings from the JSON file.
-        3. Iterates through the fetch sequence defined in the settings file.
-        4. Fetches historical data for each step and saves it as a CSV file.
-        5. Logs the progress and handles errors gracefully.
+        3. Runs the steps of the fetch sequence defined in the settings file concurrently,
+           at most MAX_CONCURRENT_STEPS at a time, since fetching is network-bound.
+           The steps share the Binance request limit of api_utils, so no more than
+           MAX_CONCURRENT_REQUESTS requests are in flight in total.
+           Steps with the same symbol and interval share a klines cache directory,
+           so they hold a common lock and run one after the other.
+        4. Fetches historical data for each step and saves it as a zstd-compressed Parquet file.
+           Klines fetched before are read from the local Parquet cache,
+           only newer klines are fetched from the API.
+        5. Logs the progress and handles errors gracefully. A step that raised
+           or was skipped is logged as failed.
 
     Arguments:
         None (Relies on command-line arguments for settings filename and dry run mode.)
@@ -58,7 +131,7 @@ def fetch_data():
         - Second argument: Dry run mode (yes/no). If "yes", no data will be fetched or saved.
 
     Returns:
-        None. This function logs the fetching process and saves data to CSV files.
+        None. This function logs the fetching process and saves data to Parquet files.
 
     Example:
         python fetch_data.py settings.json no
@@ -80,6 +153,7 @@ def fetch_data():
     settings_data = extract_settings_data(settings_filename)
     fetch_sequence = settings_data["fetch_sequence"]
     total_steps = len(fetch_sequence)
+    write_info_files = settings_data["settings"].get("write_info_files", True)
     log(f"Total steps to fetch data: {total_steps}")
 
     log(f"Fetch and save data.\n" f"Starting sequence.")
@@ -88,39 +162,35 @@ def fetch_data():
         log("Dry run mode enabled. Settings file checked.")
 
     else:
-        for i, (key, value) in enumerate(fetch_sequence.items(), start=1):
-            step_name = key
-            symbol = str(value["symbol"])
-            interval = str(value["interval"])
-            start_str = str(value["start_str"])
-
-            log(
-                f"Fetching data.\n"
-                f"Step {i}/{total_steps} - step_name: {step_name}\n"
-                f"symbol: {symbol}\n"
-                f"interval: {interval}"
-            )
-
-            try:
-                historical_klines = get_full_historical_klines(
-                    symbol=symbol, interval=interval, start_str=start_str
+        cache_locks = {
+            (value.get("symbol"), value.get("interval")): threading.Lock()
+            for value in fetch_sequence.values()
+        }
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_STEPS, max(total_steps, 1))
+        ) as executor:
+            futures = {
+                executor.submit(
+                    fetch_and_save_step,
+                    step_name,
+                    value,
+                    write_info_files,
+                    cache_locks[(value.get("symbol"), value.get("interval"))],
+                ): step_name
+                for step_name, value in fetch_sequence.items()
+            }
+            for i, future in enumerate(as_completed(futures), start=1):
+                step_name = futures[future]
+                try:
+                    step_completed = future.result()
+                except Exception as e:
+                    step_completed = False
+                    log(f"Error in fetch step {step_name}: {e}")
+
+                log(
+                    f"Fetch step {'completed' if step_completed else 'failed'}.\n"
+                    f"Step {i}/{total_steps} - step_name: {step_name}"
                 )
-            except Exception as e:
-                log(f"Error during data fetching for step {step_name}: {e}")
-                continue
-
-            csv_filename = f"mariola/data/df_{step_name}_fetched.csv"
-            info_filename = csv_filename.replace("csv", "info")
-            save_data_to_csv(historical_klines, csv_filename)
-            save_df_info(historical_klines, info_filename)
-            log(f"historical_klines saved to {csv_filename}.")
-
-            log(
-                f"Fetch step completed.\n"
-                f"Step {i}/{total_steps} - step_name: {step_name}\n"
-                f"symbol: {symbol}\n"
-                f"interval: {interval}"
-            )
 
     end_time = time()
 
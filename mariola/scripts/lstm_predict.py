@@ -8,6 +8,7 @@ on the trained LSTM model. The predictions can be for either regression or class
 tasks, depending on the settings. The result is logged throughout the process.
 
 Functions:
+    load_lstm_model() - Loads the trained LSTM model (SavedModel or .keras file).
     predict_lstm_model() - Main function for making predictions with the LSTM model.
 
 Requirements:
@@ -33,11 +34,15 @@ Last Update:
     2025-01-25
 """
 
+import os
 import sys
 from time import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1")
+import tensorflow as tf
 from tensorflow.keras.models import load_model
 from utils.app_utils import extract_settings_data
 from utils.api_utils import get_klines
@@ -45,7 +50,38 @@ from utils.df_utils import prepare_ml_df
 from utils.parser_utils import get_parsed_arguments
 from utils.logger_utils import initialize_logger, log
 from utils.plot_utils import visualise_model_prediction
-from utils.ml_utils import normalize_df, handle_pca, create_sequences
+from utils.ml_utils import (
+    normalize_df,
+    handle_pca,
+    create_sequences,
+    load_preprocessors,
+)
+
+
+def load_lstm_model(model_filename: str) -> tuple[object, bool]:
+    """
+    Loads the trained LSTM model for prediction.
+
+    If the SavedModel directory exported next to the .keras file by lstm_train exists,
+    it is loaded instead of the .keras file, so its traced serving function is reused
+    and the graph is not retraced on every run.
+
+    Arguments:
+        model_filename (str): The path to the trained .keras model file.
+
+    Returns:
+        tuple:
+            - The loaded SavedModel or Keras model.
+            - bool: True if a SavedModel was loaded (predict with its `serve` function),
+              False if the Keras model was loaded.
+    """
+    saved_model_dirname = Path(model_filename).with_suffix("")
+    if saved_model_dirname.is_dir():
+        log(f"Loading SavedModel from {saved_model_dirname}")
+        return tf.saved_model.load(str(saved_model_dirname)), True
+
+    log(f"Loading Keras model from {model_filename}")
+    return load_model(model_filename), False
 
 
 def predict_lstm_model():
@@ -55,11 +91,16 @@ def predict_lstm_model():
     The function performs the following steps:
         1. Parses command-line arguments to retrieve the settings filename and model filename.
         2. Initializes logging and loads the settings from the JSON file.
-        3. Fetches the latest data from Binance based on the provided symbol, interval, and lookback.
+        3. Fetches the latest data from Binance based on the provided symbol, interval, and lookback,
+           while the trained model is loaded in a second thread (step 6).
         4. Prepares the data for prediction by normalizing and performing PCA.
+           The scaler and PCA fitted during training ('<model>_preprocessors.joblib')
+           are only applied, not refitted. Without that file they are fitted on the fetched data.
         5. Creates sequences of the data for input into the LSTM model.
-        6. Loads the pre-trained LSTM model from the specified file.
-        7. Makes predictions based on the prepared input data.
+        6. Loads the pre-trained LSTM model with load_lstm_model, concurrently with step 3.
+        7. Makes predictions based on the prepared input data in a single
+           `predict_on_batch` call (or SavedModel `serve` call), without the callbacks
+           and progress bar of `predict`.
         8. Converts the predictions to binary values if the task is classification.
         9. Logs the results, including the latest prediction and the time taken for the process.
 
@@ -102,12 +143,21 @@ def predict_lstm_model():
     window_size = settings_data["settings"]["window_size"]
     window_lookback = settings_data["settings"]["window_lookback"]
 
-    log(f"Fetch actual {symbol} {interval} data.")
-    fetched_df = get_klines(
-        symbol=symbol,
-        interval=interval,
-        lookback=lookback,
+    log(
+        f"Fetch actual {symbol} {interval} data.\n"
+        f"Load the saved model in the meantime."
     )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fetched_df_future = executor.submit(
+            get_klines,
+            symbol=symbol,
+            interval=interval,
+            lookback=lookback,
+        )
+        loaded_model_future = executor.submit(load_lstm_model, model_filename)
+        fetched_df = fetched_df_future.result()
+        loaded_model, is_saved_model = loaded_model_future.result()
+    log(f"Load completed.")
     log(
         f"Fetch completed.\n"
         f"symbol: {symbol}\n"
@@ -131,10 +181,31 @@ def predict_lstm_model():
     )
     log(f"prepare_df completed.")
 
+    scaler, pca = None, None
+    preprocessors_filename = (
+        f"{Path(model_filename).with_suffix('')}_preprocessors.joblib"
+    )
+    if Path(preprocessors_filename).exists():
+        scaler, pca = load_preprocessors(preprocessors_filename) or (None, None)
+    else:
+        log(
+            f"{preprocessors_filename} not found. "
+            f"Scaler and PCA will be fitted on the fetched data."
+        )
+
     log(f"Normalize data." f"starting normalize_df.")
     df_normalized = normalize_df(
-        df=calculated_df, training_mode=False, result_marker=result_marker
+        df=calculated_df,
+        training_mode=False,
+        result_marker=result_marker,
+        scaler=scaler,
     )
+    if df_normalized is None:
+        log(
+            f"Error in normalize_df. Prediction aborted.\n"
+            f"Check that {preprocessors_filename} matches the model and the settings."
+        )
+        return None
     log(f"normalize_df completed.")
 
     log(
@@ -143,7 +214,10 @@ def predict_lstm_model():
         f"result_marker: {result_marker}"
     )
     df_reduced = handle_pca(
-        df_normalized=df_normalized, loaded_df=calculated_df, result_marker=None
+        df_normalized=df_normalized,
+        loaded_df=calculated_df,
+        result_marker=None,
+        pca=pca,
     )
     log(f"handle_pca completed.")
 
@@ -164,12 +238,11 @@ def predict_lstm_model():
     )
     log(f"create_sequences completed.")
 
-    log(f"Load the saved model.")
-    loaded_model = load_model(model_filename)
-    log(f"Load completed.")
-
     log(f"Prediction on new data.")
-    y_pred = loaded_model.predict(X)
+    if is_saved_model:
+        y_pred = loaded_model.serve(tf.constant(X, dtype=tf.float32)).numpy()
+    else:
+        y_pred = loaded_model.predict_on_batch(X)
     log(f"Prediction completed.")
 
     log(f"Converting the predictions to binary values (0 or 1).")
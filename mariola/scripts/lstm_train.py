@@ -2,7 +2,7 @@
 MariolaMLCryptoTradingUtils - Training LSTM Model
 
 This script is responsible for training an LSTM model (regression or classification)
-using prepared data. The process includes loading CSV files with data and configuration,
+using prepared data. The process includes loading data files and configuration,
 normalizing the data, performing PCA (Principal Component Analysis), creating sequences,
 splitting the data into training and testing sets, training the LSTM model, and saving the
 trained model as a .keras file.
@@ -20,10 +20,10 @@ Requirements:
 
 Usage:
     Run the script from the command line:
-        python3 train_lstm_model.py <settings_filename.json> <data_filename.csv>
+        python3 train_lstm_model.py <settings_filename.json> <data_filename.parquet>
 
     Example:
-        python3 train_lstm_model.py settings.json calculated_df.csv
+        python3 train_lstm_model.py settings.json calculated_df.parquet
 
 Author:
     PedroMolina
@@ -32,58 +32,74 @@ Last Update:
     2025-01-25
 """
 
+import os
 import sys
 from time import time
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1")
+import tensorflow as tf
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping
+from tensorflow.keras import mixed_precision
 from utils.parser_utils import get_parsed_arguments
 from utils.logger_utils import initialize_logger, log
 from utils.plot_utils import visualise_model_performance
-from utils.app_utils import extract_settings_data, load_data_from_csv, save_df_info
-from utils.ml_utils import normalize_df, handle_pca, create_sequences
+from utils.app_utils import extract_settings_data, load_data, save_df_info
+from utils.ml_utils import (
+    normalize_df,
+    handle_pca,
+    create_sequences,
+    create_scaler,
+    create_pca,
+    save_preprocessors,
+)
 
 
 def train_lstm_model():
     """
-    Trains an LSTM model using data from a CSV file and settings from a JSON file.
+    Trains an LSTM model using data from a Parquet (or CSV) file and settings from a JSON file.
 
     The function performs the following steps:
         1. Parses command-line arguments to retrieve the settings filename and data filename.
         2. Initializes logging and loads the settings from the JSON file.
-        3. Loads the data from the CSV file and normalizes it.
+        3. Loads the data from the data file and normalizes it.
         4. Performs Principal Component Analysis (PCA) on the normalized data.
         5. Creates sequences of the data for training.
         6. Splits the data into training and testing sets.
         7. Defines the LSTM model architecture, including input, dropout, and output layers.
+           If the optional "mixed_precision" setting is true, the model computes in float16
+           (mixed_float16 policy) while the output layer stays float32 for a stable loss.
         8. Compiles the model with appropriate loss function and optimizer.
         9. Trains the model on the prepared data, using early stopping to avoid overfitting.
+           The batch size comes from the optional "batch_size" setting (default 128).
         10. Evaluates the model on the test data and logs the results.
-        11. Saves the trained model as a .keras file.
+        11. Saves the trained model as a .keras file and exports it as a SavedModel
+            directory (same name without the suffix) used by lstm_predict for fast loading.
+            The fitted scaler and PCA are saved next to it as '<model>_preprocessors.joblib'.
 
     Arguments:
         None (Relies on command-line arguments.)
 
     Command-line Arguments:
         - First argument: The path to the JSON settings file.
-        - Second argument: The path to the CSV data file.
+        - Second argument: The path to the Parquet (or CSV) data file.
 
     Returns:
         None
 
     Example:
-        python3 train_lstm_model.py settings.json calculated_df.csv
+        python3 train_lstm_model.py settings.json calculated_df.parquet
     """
 
     start_time = time()
 
     settings_filename, data_filename = get_parsed_arguments(
         first_arg_string="Settings filename.json",
-        second_arg_string="Calculated and prepared data filename.csv",
+        second_arg_string="Calculated and prepared data filename (.parquet or .csv)",
     )
 
     initialize_logger(settings_filename)
@@ -101,20 +117,27 @@ def train_lstm_model():
     lookback = settings_data["settings"]["window_lookback"]
     test_size = settings_data["settings"]["test_size"]
     random_state = settings_data["settings"]["random_state"]
+    use_mixed_precision = settings_data["settings"].get("mixed_precision", False)
+    batch_size = settings_data["settings"].get("batch_size", 128)
+    write_info_files = settings_data["settings"].get("write_info_files", True)
 
     log(
-        f"Load data from csv file.\n"
-        f"starting load_data_from_csv.\n"
+        f"Load data from file.\n"
+        f"starting load_data.\n"
         f"filename: {data_filename}"
     )
-    loaded_df = load_data_from_csv(data_filename)
-    log(f"load_data_from_csv completed.")
+    loaded_df = load_data(data_filename)
+    log(f"load_data completed.")
 
     log(f"Normalize data." f"starting normalize_df.")
-    df_normalized = normalize_df(df=loaded_df, result_marker=result_marker)
-    csv_filename = data_filename.replace("_calculated", "_normalized")
-    info_filename = csv_filename.replace("csv", "info")
-    save_df_info(df_normalized, info_filename)
+    scaler = create_scaler()
+    df_normalized = normalize_df(
+        df=loaded_df, result_marker=result_marker, scaler=scaler
+    )
+    stage_filename = data_filename.replace("_calculated", "_normalized")
+    info_filename = str(Path(stage_filename).with_suffix(".info"))
+    if write_info_files:
+        save_df_info(df_normalized, info_filename)
     log(f"normalize_df completed.")
 
     log(
@@ -122,12 +145,17 @@ def train_lstm_model():
         f"starting handle_pca.\n"
         f"result_marker: {result_marker}"
     )
+    pca = create_pca()
     df_reduced = handle_pca(
-        df_normalized=df_normalized, loaded_df=loaded_df, result_marker=result_marker
+        df_normalized=df_normalized,
+        loaded_df=loaded_df,
+        result_marker=result_marker,
+        pca=pca,
     )
-    csv_filename = csv_filename.replace("_normalized", "_pca_analyzed")
-    info_filename = csv_filename.replace("csv", "info")
-    save_df_info(df_reduced, info_filename)
+    stage_filename = stage_filename.replace("_normalized", "_pca_analyzed")
+    info_filename = str(Path(stage_filename).with_suffix(".info"))
+    if write_info_files:
+        save_df_info(df_reduced, info_filename)
     log(f"handle_pca completed.")
 
     log(
@@ -143,8 +171,8 @@ def train_lstm_model():
         result_marker=result_marker,
         training_mode=True,
     )
-    csv_filename = csv_filename.replace("_pca_analyzed", "_sequenced")
-    info_filename = csv_filename.replace("csv", "info")
+    stage_filename = stage_filename.replace("_pca_analyzed", "_sequenced")
+    info_filename = str(Path(stage_filename).with_suffix(".info"))
     log(f"create_sequences completed.")
 
     log(
@@ -158,6 +186,18 @@ def train_lstm_model():
     )
     log(f"train_test_split completed.")
 
+    if use_mixed_precision:
+        log(f"Mixed precision enabled (mixed_float16 policy).")
+        mixed_precision.set_global_policy("mixed_float16")
+
+    gpus = tf.config.list_logical_devices("GPU")
+    log(
+        f"GPU devices: {[gpu.name for gpu in gpus]}. "
+        f"The LSTM keeps its cuDNN-compatible defaults, so the fused cuDNN kernel is used on GPU."
+        if gpus
+        else "No GPU found. The LSTM will be trained on CPU."
+    )
+
     log(f"Creating the LSTM model.")
     model = Sequential()
     log(f"Creating completed.")
@@ -178,9 +218,9 @@ def train_lstm_model():
 
     log(f"Output layer (binary classification - predicting one label).")
     if classification:
-        model.add(Dense(units=1, activation="sigmoid"))
+        model.add(Dense(units=1, activation="sigmoid", dtype="float32"))
     elif regression:
-        model.add(Dense(1))
+        model.add(Dense(1, dtype="float32"))
     log(f"Layers completed.")
 
     log(f"Compiling the model.")
@@ -195,7 +235,8 @@ def train_lstm_model():
     log(
         f"Training the model.\n"
         f"X_train shape: {X_train.shape}\n"
-        f"y_train shape: {y_train.shape}"
+        f"y_train shape: {y_train.shape}\n"
+        f"batch_size: {batch_size}"
     )
     early_stopping = EarlyStopping(
         monitor="val_loss", patience=3, restore_best_weights=True
@@ -204,7 +245,7 @@ def train_lstm_model():
         X_train,
         y_train,
         epochs=50,
-        batch_size=32,
+        batch_size=batch_size,
         validation_data=(X_test, y_test),
         callbacks=[early_stopping],
     )
@@ -213,18 +254,25 @@ def train_lstm_model():
     model.summary()
 
     log("Evaluating the model on test data.")
-    y_pred = model.predict(X_test)
+    y_pred = model.predict(X_test, batch_size=max(batch_size, 512), verbose=0)
     test_loss, test_accuracy = model.evaluate(X_test, y_test, verbose=0)
     log(f"Test Loss: {test_loss:.4f}, Test Accuracy: {test_accuracy:.4f}")
 
-    model_filename = (
-        csv_filename.replace("df_", "model_")
-        .replace("_sequenced", "_lstm")
-        .replace("csv", "keras")
+    model_filename = str(
+        Path(
+            stage_filename.replace("df_", "model_").replace("_sequenced", "_lstm")
+        ).with_suffix(".keras")
     )
     model.save(model_filename)
     log(f"Model saved as {model_filename}")
 
+    saved_model_dirname = str(Path(model_filename).with_suffix(""))
+    model.export(saved_model_dirname)
+    log(f"SavedModel with serving signature exported to {saved_model_dirname}")
+
+    preprocessors_filename = f"{saved_model_dirname}_preprocessors.joblib"
+    save_preprocessors(scaler, pca, preprocessors_filename)
+
     end_time = time()
 
     log(
@@ -2,7 +2,7 @@
 MariolaMLCryptoTradingUtils - Training Random Forest Model
 
 This script is responsible for training a Random Forest model (regression or classification)
-using prepared data. The process includes loading CSV files with data and configuration,
+using prepared data. The process includes loading data files and configuration,
 preparing features, training the model, evaluating results, performing feature selection,
 and saving the trained model as a .joblib file.
 
@@ -17,10 +17,10 @@ Requirements:
 
 Usage:
     Run the script from the command line:
-        python3 train_rf_model.py <settings_filename.json> <data_filename.csv>
+        python3 train_rf_model.py <settings_filename.json> <data_filename.parquet>
 
     Example:
-        python3 train_rf_model.py settings.json calculated_df.csv
+        python3 train_rf_model.py settings.json calculated_df.parquet
 
 Author:
     PedroMolina
@@ -46,19 +46,20 @@ from utils.logger_utils import initialize_logger, log
 from utils.plot_utils import visualise_model_performance
 from utils.app_utils import (
     extract_settings_data,
-    load_data_from_csv,
+    load_data,
 )
 
 
 def train_rf_model():
     """
-    Trains a Random Forest model using data from a CSV file and settings from a JSON file.
+    Trains a Random Forest model using data from a Parquet (or CSV) file and settings from a JSON file.
 
     The function performs the following steps:
         1. Parses command-line arguments to retrieve the settings filename and data filename.
         2. Loads configuration settings from the JSON file.
-        3. Loads data from the CSV file.
-        4. Trains a Random Forest model using the prepared data.
+        3. Loads data from the data file.
+        4. Trains a Random Forest model using the prepared data. All target columns
+           (result_marker and any 'marker_*' column) are excluded from the features.
         5. Evaluates the model's performance and logs the results.
         6. Selects the most important features based on the trained model.
         7. Saves the trained model to a .joblib file.
@@ -68,20 +69,20 @@ def train_rf_model():
 
     Command-line Arguments:
         - First argument: The path to the JSON settings file.
-        - Second argument: The path to the CSV data file.
+        - Second argument: The path to the Parquet (or CSV) data file.
 
     Returns:
         None
 
     Example:
-        python3 train_rf_model.py settings.json calculated_df.csv
+        python3 train_rf_model.py settings.json calculated_df.parquet
     """
 
     start_time = time()
 
     settings_filename, data_filename = get_parsed_arguments(
         first_arg_string="Settings filename.json",
-        second_arg_string="Calculated and prepared data filename.csv",
+        second_arg_string="Calculated and prepared data filename (.parquet or .csv)",
     )
 
     initialize_logger(settings_filename)
@@ -98,8 +99,8 @@ def train_rf_model():
     test_size = settings_data["settings"]["test_size"]
     random_state = settings_data["settings"]["random_state"]
 
-    log("Loading data from CSV file.")
-    loaded_df = load_data_from_csv(data_filename)
+    log("Loading data from file.")
+    loaded_df = load_data(data_filename)
     log("Data loading completed.")
 
     if result_marker not in loaded_df.columns:
@@ -107,7 +108,12 @@ def train_rf_model():
         raise ValueError(f"result_marker '{result_marker}' not found in DataFrame.")
 
     log(f"Splitting data into training and testing sets " f"(test_size={test_size}).")
-    X = loaded_df.drop(columns=[result_marker])
+    marker_columns = [
+        column
+        for column in loaded_df.columns
+        if column == result_marker or column.startswith("marker_")
+    ]
+    X = loaded_df.drop(columns=marker_columns)
     y = loaded_df[result_marker]
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=test_size, random_state=random_state
@@ -157,10 +163,10 @@ def train_rf_model():
     X_train_selected = selector.transform(X_train)
     X_test_selected = selector.transform(X_test)
 
-    model_filename = (
-        data_filename.replace("df_", "model_")
-        .replace("_calculated", "_rf")
-        .replace(".csv", ".joblib")
+    model_filename = str(
+        Path(
+            data_filename.replace("df_", "model_").replace("_calculated", "_rf")
+        ).with_suffix(".joblib")
     )
     joblib.dump(model, model_filename)
     log(f"Model saved as {model_filename}")
@@ -2,7 +2,7 @@
 MariolaMLCryptoTradingUtils - Training XGBoost Model
 
 This script is responsible for training an XGBoost model (regression or classification)
-using prepared data. The process includes loading CSV files with data and configuration,
+using prepared data. The process includes loading data files and configuration,
 preparing features, training the model, evaluating results, and saving the trained model.
 
 Functions:
@@ -17,10 +17,10 @@ Requirements:
 
 Usage:
     Run the script from the command line:
-        python3 train_xgboost_model.py <settings_filename.json> <data_filename.csv>
+        python3 train_xgboost_model.py <settings_filename.json> <data_filename.parquet>
 
     Example:
-        python3 train_xgboost_model.py settings.json calculated_df.csv
+        python3 train_xgboost_model.py settings.json calculated_df.parquet
 
 Author:
     PedroMolina
@@ -42,19 +42,20 @@ from sklearn.metrics import mean_squared_error, r2_score
 from utils.parser_utils import get_parsed_arguments
 from utils.logger_utils import initialize_logger, log
 from utils.plot_utils import visualise_model_performance
-from utils.app_utils import extract_settings_data, load_data_from_csv
+from utils.app_utils import extract_settings_data, load_data
 
 
 def train_xgboost_model():
     """
-    Trains an XGBoost regression or classification model using data from a CSV file
+    Trains an XGBoost regression or classification model using data from a Parquet (or CSV) file
     and settings from a JSON file.
 
     The function performs the following steps:
         1. Parses command-line arguments to retrieve the settings filename and data filename.
         2. Loads configuration settings from the JSON file.
-        3. Loads data from the CSV file.
-        4. Prepares features and target variables.
+        3. Loads data from the data file.
+        4. Prepares features and target variables. All target columns (result_marker
+           and any 'marker_*' column) are excluded from the features.
         5. Splits data into training and testing sets.
         6. Handles missing or infinite values in data.
         7. Scales the data using StandardScaler.
@@ -64,19 +65,19 @@ def train_xgboost_model():
 
     Command-line Arguments:
         - First argument: The path to the JSON settings file.
-        - Second argument: The path to the CSV data file.
+        - Second argument: The path to the Parquet (or CSV) data file.
 
     Returns:
         None
 
     Example:
-        python3 train_xgboost_model.py settings.json calculated_df.csv
+        python3 train_xgboost_model.py settings.json calculated_df.parquet
     """
     start_time = time()
 
     settings_filename, data_filename = get_parsed_arguments(
         first_arg_string="Settings filename.json",
-        second_arg_string="Calculated and prepared data filename.csv",
+        second_arg_string="Calculated and prepared data filename (.parquet or .csv)",
     )
 
     initialize_logger(settings_filename)
@@ -94,11 +95,11 @@ def train_xgboost_model():
     random_state = settings_data["settings"]["random_state"]
 
     log(
-        f"Loading data from CSV file.\n"
-        f"Starting load_data_from_csv.\n"
+        f"Loading data from file.\n"
+        f"Starting load_data.\n"
         f"Filename: {data_filename}"
     )
-    loaded_df = load_data_from_csv(data_filename)
+    loaded_df = load_data(data_filename)
     log(f"Data loading completed.")
 
     if result_marker not in loaded_df.columns:
@@ -106,7 +107,12 @@ def train_xgboost_model():
         raise ValueError(f"result_marker '{result_marker}' not found in DataFrame.")
 
     log(f"Preparing features and target variable.")
-    X = loaded_df.drop(columns=result_marker)
+    marker_columns = [
+        column
+        for column in loaded_df.columns
+        if column == result_marker or column.startswith("marker_")
+    ]
+    X = loaded_df.drop(columns=marker_columns)
     y = loaded_df[result_marker]
     X = X.fillna(0)
     log(f"Data preparation completed.")
@@ -170,10 +176,10 @@ def train_xgboost_model():
     log(f"Mean Squared Error: {mse}")
     log(f"R-squared: {r2}")
 
-    model_filename = (
-        data_filename.replace("df_", "model_")
-        .replace("_calculated", "_xgboost")
-        .replace("csv", "model")
+    model_filename = str(
+        Path(
+            data_filename.replace("df_", "model_").replace("_calculated", "_xgboost")
+        ).with_suffix(".model")
     )
     model.save_model(model_filename)
     log(f"Model saved as {model_filename}")
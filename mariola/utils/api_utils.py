@@ -1,16 +1,76 @@
 from dotenv import load_dotenv
-from datetime import datetime as dt, timedelta
+from datetime import datetime as dt, timedelta, timezone
+import re
 import time
+import threading
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from binance.client import Client
+from binance.helpers import interval_to_milliseconds
 import os
 from utils.logger_utils import log
 from utils.exception_handler import exception_handler
 from utils.retry_connection import retry_connection
+from utils.cache_utils import (
+    KLINES_CACHE_DIR,
+    load_cached_klines,
+    update_cached_klines,
+)
 from typing import Optional, Union
 
 load_dotenv()
 
+KLINES_PER_REQUEST = 1000
+MAX_CONCURRENT_REQUESTS = 8
+REQUEST_WEIGHT_LIMIT = 1200
+REQUEST_WEIGHT_SAFETY_MARGIN = 100
+
+KLINES_COLUMNS_DTYPES = {
+    "open_time": np.int64,
+    "open": np.float32,
+    "high": np.float32,
+    "low": np.float32,
+    "close": np.float32,
+    "volume": np.float32,
+    "close_time": np.int64,
+    "quote_asset_volume": np.float32,
+    "number_of_trades": np.int32,
+    "taker_buy_base_asset_volume": np.float32,
+    "taker_buy_quote_asset_volume": np.float32,
+}
+KLINES_CACHE_DTYPES = {
+    column: np.float64 if dtype is np.float32 else dtype
+    for column, dtype in KLINES_COLUMNS_DTYPES.items()
+}
+
+LOOKBACK_PATTERN = re.compile(r"^(\d+)([hdm])$")
+LOOKBACK_UNITS = {"h": "hours", "d": "days", "m": "minutes"}
+
+_binance_clients = {}
+_binance_clients_lock = threading.Lock()
+_requests_semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_request_weight_lock = threading.Lock()
+_request_weight = {"minute": None, "used": 0}
+
+
+@dataclass
+class Klines:
+    """
+    OHLCV klines held as plain NumPy arrays, one array per field.
+
+    Returned by get_klines(raw=True) for callers that only need the price
+    and volume arrays and do not need a DataFrame.
+    """
+
+    open_time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
 
 @exception_handler()
 @retry_connection()
@@ -18,6 +78,10 @@ def create_binance_client() -> Optional[Client]:
     """
     Creates and returns a Binance client using API keys from environment variables.
 
+    Clients are cached per API key pair, so repeated calls reuse the same client
+    and its HTTPS connection pool instead of reconnecting on every fetch.
+    The cache is guarded by a lock, so concurrent first calls build a single client.
+
     Returns:
         Client: A Binance client object, or None if an error occurs during client creation.
     """
@@ -25,19 +89,157 @@ def create_binance_client() -> Optional[Client]:
     api_secret = os.environ.get("BINANCE_GENERAL_API_SECRET")
     if not api_key or not api_secret:
         return None
-    binance_client = Client(api_key, api_secret)
+
+    with _binance_clients_lock:
+        binance_client = _binance_clients.get((api_key, api_secret))
+        if binance_client is None:
+            binance_client = Client(api_key, api_secret)
+            _binance_clients[(api_key, api_secret)] = binance_client
     return binance_client
 
 
+def wait_for_request_weight(binance_client: Client) -> None:
+    """
+    Waits for the next minute if the client is close to the Binance request weight limit.
+
+    Binance reports the request weight used in the current minute in the
+    'x-mbx-used-weight-1m' header of every response. The client's last response may
+    have been written by any thread sharing the client, so the highest weight seen in
+    the current minute is tracked module-wide and used instead of a single reading.
+    The function only sleeps when that weight is within REQUEST_WEIGHT_SAFETY_MARGIN of
+    REQUEST_WEIGHT_LIMIT, so fetches run at full speed while there is budget left.
+
+    Args:
+        binance_client (Client): The Binance client whose last response is checked.
+
+    Returns:
+        None
+    """
+    response = getattr(binance_client, "response", None)
+    if response is None:
+        return
+
+    reported_weight = int(response.headers.get("x-mbx-used-weight-1m", 0))
+    with _request_weight_lock:
+        minute = int(time.time() // 60)
+        if _request_weight["minute"] != minute:
+            _request_weight.update(minute=minute, used=0)
+        _request_weight["used"] = max(_request_weight["used"], reported_weight)
+        used_weight = _request_weight["used"]
+
+    if used_weight > REQUEST_WEIGHT_LIMIT - REQUEST_WEIGHT_SAFETY_MARGIN:
+        wait_seconds = 60 - time.time() % 60
+        log(f"Request weight {used_weight} used. Waiting {wait_seconds:.1f} seconds.")
+        time.sleep(wait_seconds)
+        with _request_weight_lock:
+            _request_weight.update(minute=None, used=0)
+
+
+def parse_lookback(lookback: str) -> timedelta:
+    """
+    Parses a lookback period such as '10h', '9d' or '30m' into a timedelta.
+
+    Args:
+        lookback (str): The lookback period, a number followed by 'h', 'd' or 'm'.
+
+    Returns:
+        timedelta: The parsed lookback period.
+
+    Raises:
+        ValueError: If the lookback period format is not supported.
+    """
+    match = LOOKBACK_PATTERN.match(lookback)
+    if not match:
+        raise ValueError(f"Unsupported lookback period format: {lookback}")
+
+    amount, unit = match.groups()
+    return timedelta(**{LOOKBACK_UNITS[unit]: int(amount)})
+
+
+def parse_start_time(start_str: Union[str, int]) -> int:
+    """
+    Parses a start time such as '1 Jan, 2020' or a timestamp in milliseconds.
+
+    Args:
+        start_str (str | int): The start time in the format '1 Jan, 2020' (UTC)
+                               or a timestamp in milliseconds.
+
+    Returns:
+        int: The start time as a UTC timestamp in milliseconds.
+
+    Raises:
+        ValueError: If the start time format is not supported.
+    """
+    if isinstance(start_str, str) and not start_str.isdigit():
+        start_date = dt.strptime(start_str, "%d %b, %Y").replace(tzinfo=timezone.utc)
+        return int(start_date.timestamp() * 1000)
+
+    return int(start_str)
+
+
+def klines_to_df(klines: list, dtypes: dict = KLINES_COLUMNS_DTYPES) -> pd.DataFrame:
+    """
+    Converts raw Binance klines into a DataFrame with typed columns.
+
+    Each column is cast once from the raw kline values to its final dtype
+    (see KLINES_COLUMNS_DTYPES). Prices and volumes are stored as float32,
+    which halves memory for long histories while keeping enough precision
+    for crypto prices. Klines written to the cache are converted with
+    KLINES_CACHE_DTYPES instead, which keeps them as float64, so the only
+    stored copy of the raw data does not lose precision.
+    The trailing unused 'ignore' field is dropped.
+
+    Args:
+        klines (list): A list of klines as returned by the Binance API.
+        dtypes (dict): The dtype of each column, KLINES_COLUMNS_DTYPES or KLINES_CACHE_DTYPES.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the columns listed in KLINES_COLUMNS_DTYPES.
+    """
+    klines_array = np.array(klines, dtype=object).reshape(
+        len(klines), len(dtypes) + 1
+    )
+    return pd.DataFrame(
+        {
+            column: klines_array[:, i].astype(dtype)
+            for i, (column, dtype) in enumerate(dtypes.items())
+        }
+    )
+
+
+def klines_to_arrays(klines: list) -> Klines:
+    """
+    Converts raw Binance klines into OHLCV NumPy arrays without building a DataFrame.
+
+    Args:
+        klines (list): A list of klines as returned by the Binance API.
+
+    Returns:
+        Klines: The open_time (int64) and open, high, low, close, volume (float32) arrays.
+    """
+    klines_array = np.array(klines, dtype=object).reshape(
+        len(klines), len(KLINES_COLUMNS_DTYPES) + 1
+    )
+    return Klines(
+        **{
+            column: klines_array[:, i].astype(dtype)
+            for i, (column, dtype) in enumerate(KLINES_COLUMNS_DTYPES.items())
+            if column in Klines.__dataclass_fields__
+        }
+    )
+
+
 @exception_handler()
 @retry_connection()
 def get_klines(
     symbol: str = "BTCUSDC",
     interval: str = "1h",
     lookback: str = "2d",
-    start_str: Optional[str] = None,
-    end_str: Optional[str] = None,
-) -> Optional[pd.DataFrame]:
+    start_str: Optional[Union[str, int]] = None,
+    end_str: Optional[Union[str, int]] = None,
+    binance_client: Optional[Client] = None,
+    raw: bool = False,
+) -> Optional[Union[pd.DataFrame, Klines]]:
     """
     Fetch historical market data (klines) from Binance for a given symbol and time range.
 
@@ -45,36 +247,31 @@ def get_klines(
         symbol (str): The trading pair symbol (default is 'BTCUSDC').
         interval (str): The time interval for each kline (default is '1h').
         lookback (str): The lookback period for fetching data (e.g., '1000d' for 1000 days, '10h' for 10 hours).
-        start_str (str, optional): The start time for fetching data in 'YYYY-MM-DD HH:MM:SS' format.
-                                   If not provided, the lookback period will be used.
-        end_str (str, optional): The end time for fetching data in 'YYYY-MM-DD HH:MM:SS' format.
+        start_str (str | int, optional): The start time for fetching data in 'YYYY-MM-DD HH:MM:SS' format
+                                         or as a timestamp in milliseconds.
+                                         If not provided, the lookback period will be used.
+        end_str (str | int, optional): The end time for fetching data in 'YYYY-MM-DD HH:MM:SS' format
+                                       or as a timestamp in milliseconds.
+        binance_client (Client, optional): An existing Binance client to use.
+                                           If not provided, the cached client is used.
+        raw (bool): If True, return the OHLCV NumPy arrays as Klines instead of a DataFrame.
 
     Returns:
+        Klines: The OHLCV arrays, if raw is True.
         pd.DataFrame: A DataFrame containing the historical kline data with the following columns:
             ['open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time',
              'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume',
-             'taker_buy_quote_asset_volume', 'ignore'].
+             'taker_buy_quote_asset_volume'].
         None: If an error occurs during data retrieval (e.g., API exceptions, connection issues).
     """
-    binance_client = create_binance_client()
+    binance_client = binance_client or create_binance_client()
     if not binance_client:
         return None
 
     klines = None
     if not start_str and not end_str:
-        if lookback[-1] == "h":
-            hours = int(lookback[:-1])
-            start_time = dt.utcnow() - timedelta(hours=hours)
-        elif lookback[-1] == "d":
-            days = int(lookback[:-1])
-            start_time = dt.utcnow() - timedelta(days=days)
-        elif lookback[-1] == "m":
-            minutes = int(lookback[:-1])
-            start_time = dt.utcnow() - timedelta(minutes=minutes)
-        else:
-            raise ValueError("Unsupported lookback period format.")
-
-        start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
+        lookback_ms = parse_lookback(lookback) // timedelta(milliseconds=1)
+        start_str = int(time.time() * 1000) - lookback_ms
 
         klines = binance_client.get_historical_klines(
             symbol=symbol, interval=interval, start_str=start_str
@@ -83,30 +280,14 @@ def get_klines(
         klines = binance_client.get_historical_klines(
             symbol=symbol,
             interval=interval,
-            start_str=str(start_str),
-            end_str=str(end_str),
+            start_str=start_str,
+            end_str=end_str,
         )
 
-    df = pd.DataFrame(
-        klines,
-        columns=[
-            "open_time",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "close_time",
-            "quote_asset_volume",
-            "number_of_trades",
-            "taker_buy_base_asset_volume",
-            "taker_buy_quote_asset_volume",
-            "ignore",
-        ],
-    )
-    df["close"] = df["close"].astype(float)
-    df["high"] = df["high"].astype(float)
-    df["low"] = df["low"].astype(float)
+    if raw:
+        return klines_to_arrays(klines)
+
+    df = klines_to_df(klines)
 
     return df
 
@@ -114,50 +295,71 @@ def get_klines(
 @exception_handler()
 @retry_connection()
 def get_full_historical_klines(
-    symbol: str = "BTCUSDC", interval: str = "1h", start_str: Union[str, int] = None
+    symbol: str = "BTCUSDC",
+    interval: str = "1h",
+    start_str: Union[str, int] = None,
+    binance_client: Optional[Client] = None,
+    end_str: Optional[int] = None,
+    cache_dir: Optional[str] = None,
 ) -> Optional[pd.DataFrame]:
     """
     Fetches complete historical data for a given symbol from the Binance API.
 
-    The function retrieves data in intervals of up to 1000 candles per request
-    and iterates until it collects all the data from the specified start time
-    (start_str) up to the present time.
+    The function splits the time range from the first available kline up to the
+    present time (or up to end_str) into windows of up to 1000 candles and fetches the windows
+    concurrently. At most MAX_CONCURRENT_REQUESTS requests are in flight across all
+    concurrent calls (e.g. parallel fetch_data steps sharing the cached client),
+    which keeps them within the client's HTTP connection pool.
+    Results are merged in open_time order. A window that fails with a transient
+    connection or API error is retried on its own with exponential backoff,
+    so windows that were already fetched are not fetched again.
+    If a window still fails after its retries, the queued windows are cancelled and,
+    when cache_dir is given, the windows fetched so far are merged into the klines cache,
+    so get_cached_historical_klines fetches only the missing ranges on the next run.
+    Prices and volumes are returned as float64 (see KLINES_CACHE_DTYPES),
+    so the klines can be cached without losing precision.
 
     Parameters:
         symbol (str): The trading pair symbol, e.g., 'BTCUSDC' (default is 'BTCUSDC').
         interval (str): The time interval for the candles, e.g., '1m', '5m', '1h', '1d' (default is '1h').
         start_str (str): The start time in the format '1 Jan, 2020' or timestamp in milliseconds.
+        binance_client (Client, optional): An existing Binance client to use.
+                                           If not provided, the cached client is used.
+        end_str (int, optional): The end time as a timestamp in milliseconds (exclusive).
+                                 If not provided, klines up to the present time are fetched.
+        cache_dir (str, optional): The root directory of the klines cache the fetched windows
+                                   are saved to if the fetch fails.
 
     Returns:
         pd.DataFrame: A DataFrame containing the historical data with the following columns:
             'open_time', 'open', 'high', 'low', 'close', 'volume',
             'close_time', 'quote_asset_volume', 'number_of_trades',
-            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'.
+            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume'.
+            The DataFrame is empty if no klines are available before end_str.
         If an error occurs, the function returns None.
     """
     all_klines = []
-    binance_client = create_binance_client()
+    binance_client = binance_client or create_binance_client()
 
     if not binance_client:
         return None
 
-    if isinstance(start_str, int):
-        start_str = str(start_str)
-    if isinstance(start_str, str):
-        start_date = dt.strptime(start_str, "%d %b, %Y")
-        start_str = str(int(start_date.timestamp() * 1000))
-
-    timestamp = int(start_str) / 1000
-    start_date = dt.utcfromtimestamp(timestamp)
+    start_str = parse_start_time(start_str)
+    start_date = dt.fromtimestamp(int(start_str) / 1000, timezone.utc)
     log(f"Ready to fetch all {symbol} {interval} klines data. start_str: {start_date}")
 
-    klines_count = binance_client.get_historical_klines(
-        symbol=symbol, interval=interval, start_str=start_str, limit=1
+    interval_ms = interval_to_milliseconds(interval)
+    if not interval_ms:
+        log(f"Error. Unsupported interval: {interval}")
+        return None
+
+    first_klines = binance_client.get_klines(
+        symbol=symbol, interval=interval, startTime=int(start_str), limit=1
     )
 
-    if klines_count:
-        first_kline_timestamp = klines_count[0][0]
-        first_kline_date = dt.utcfromtimestamp(first_kline_timestamp / 1000)
+    if first_klines:
+        first_kline_timestamp = first_klines[0][0]
+        first_kline_date = dt.fromtimestamp(first_kline_timestamp / 1000, timezone.utc)
         log(
             f"First available kline timestamp: {first_kline_timestamp}, "
             f"corresponding to {first_kline_date}"
@@ -166,73 +368,155 @@ def get_full_historical_klines(
         log("No data available.")
         return None
 
-    now = dt.now()
-    delta = now - start_date
+    end_timestamp = int(end_str) if end_str else int(time.time() * 1000)
+    window_ms = KLINES_PER_REQUEST * interval_ms
+    windows_starts = range(first_kline_timestamp, end_timestamp, window_ms)
+    total_iterations = len(windows_starts)
+    log(
+        f"Total candles from first kline: {max(end_timestamp - first_kline_timestamp, 0) // interval_ms}\n"
+        f"Total iterations required: {total_iterations}"
+    )
 
-    total_candles = None
-    if interval == "1h":
-        total_candles = delta.total_seconds() / 3600
-    elif interval == "30m":
-        total_candles = delta.total_seconds() / 1800
-    elif interval == "15m":
-        total_candles = delta.total_seconds() / 900
-    else:
-        log(f"Error. Wrong start date: {start_date} or delta: {delta}")
+    @retry_connection(max_retries=5)
+    def fetch_klines_window(window_start: int) -> list:
+        with _requests_semaphore:
+            wait_for_request_weight(binance_client)
+            return binance_client.get_klines(
+                symbol=symbol,
+                interval=interval,
+                startTime=window_start,
+                endTime=min(window_start + window_ms, end_timestamp) - 1,
+                limit=KLINES_PER_REQUEST,
+            )
+
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+    futures = [executor.submit(fetch_klines_window, start) for start in windows_starts]
+    try:
+        for iteration, future in enumerate(as_completed(futures), start=1):
+            future.result()
+            log(
+                f"Progress: {iteration}/{total_iterations} iterations completed - "
+                f"{symbol} {interval} klines data."
+            )
+    except Exception as e:
+        executor.shutdown(wait=True, cancel_futures=True)
+        log(f"Error fetching {symbol} {interval} klines data: {e}")
+        for future in futures:
+            if future.done() and not future.cancelled() and not future.exception():
+                all_klines.extend(future.result())
+        if cache_dir is not None and all_klines:
+            update_cached_klines(
+                klines_to_df(all_klines, KLINES_CACHE_DTYPES),
+                symbol,
+                interval,
+                cache_dir,
+            )
+            log(f"{len(all_klines)} fetched {symbol} {interval} klines checkpointed.")
         return None
+    finally:
+        executor.shutdown(wait=False)
 
-    log(f"Total candles from start date: {total_candles}")
+    for future in futures:
+        all_klines.extend(future.result())
 
-    candles_per_iteration = 1000
-    total_iterations = (total_candles // candles_per_iteration) + (
-        1 if total_candles % candles_per_iteration else 0
-    )
-    log(f"Total iterations required: {total_iterations}")
+    df = klines_to_df(all_klines, KLINES_CACHE_DTYPES)
 
-    iteration = 0
-    while iteration < total_iterations:
-        iteration += 1
-        log(
-            f"Fetching iteration {iteration}/{total_iterations} - {symbol} {interval} klines data."
-        )
-        klines = binance_client.get_historical_klines(
+    log(f"All {symbol} {interval} klines data fetched successfully.")
+    return df
+
+
+@exception_handler()
+def get_cached_historical_klines(
+    symbol: str = "BTCUSDC",
+    interval: str = "1h",
+    start_str: Union[str, int] = None,
+    cache_dir: str = KLINES_CACHE_DIR,
+    binance_client: Optional[Client] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetches complete historical data for a given symbol, reusing the local Parquet cache.
+
+    On the first call all klines since start_str are fetched with get_full_historical_klines
+    and cached. On subsequent calls only the klines missing from the cache are fetched:
+        - the klines from start_str up to the first cached candle, if start_str was moved earlier,
+        - the klines in every gap between cached candles (e.g. a lost yearly partition);
+          a gap caused by an exchange outage costs a single request on every call,
+        - the klines from the last cached candle onwards. The last cached candle is
+          fetched again, because it may have been cached before it closed.
+    Only the yearly cache partitions that received new klines are rewritten; the other
+    partitions are left untouched. The cache keeps prices and volumes as float64,
+    the returned DataFrame is downcast to KLINES_COLUMNS_DTYPES and holds only the
+    klines from start_str onwards.
+
+    Parameters:
+        symbol (str): The trading pair symbol, e.g., 'BTCUSDC' (default is 'BTCUSDC').
+        interval (str): The time interval for the candles, e.g., '1m', '5m', '1h', '1d' (default is '1h').
+        start_str (str): The start time in the format '1 Jan, 2020' or timestamp in milliseconds.
+        cache_dir (str): The root directory of the klines cache.
+        binance_client (Client, optional): An existing Binance client to use.
+                                           If not provided, the cached client is used.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the same columns as returned by get_full_historical_klines.
+        If an error occurs, the function returns None.
+    """
+    start_time = parse_start_time(start_str) if start_str is not None else None
+    cached_klines = load_cached_klines(symbol, interval, cache_dir)
+
+    if cached_klines is None:
+        new_klines = get_full_historical_klines(
             symbol=symbol,
             interval=interval,
-            start_str=start_str,
-            limit=candles_per_iteration,
+            start_str=start_time,
+            binance_client=binance_client,
+            cache_dir=cache_dir,
+        )
+        if new_klines is None:
+            return None
+        df = update_cached_klines(new_klines, symbol, interval, cache_dir)
+    else:
+        interval_ms = interval_to_milliseconds(interval)
+        open_times = cached_klines["open_time"].to_numpy()
+        missing_ranges = []
+        if start_time is not None and start_time < open_times[0]:
+            missing_ranges.append((start_time, int(open_times[0])))
+        missing_ranges.extend(
+            (int(open_times[i]) + interval_ms, int(open_times[i + 1]))
+            for i in np.flatnonzero(np.diff(open_times) > interval_ms)
         )
+        missing_ranges.append((int(open_times[-1]), None))
+
+        fetched_klines = []
+        for range_start, range_end in missing_ranges:
+            klines = get_full_historical_klines(
+                symbol=symbol,
+                interval=interval,
+                start_str=range_start,
+                end_str=range_end,
+                binance_client=binance_client,
+                cache_dir=cache_dir,
+            )
+            if klines is None:
+                log(f"{symbol} {interval} klines from {range_start} not fetched.")
+            elif not klines.empty:
+                fetched_klines.append(klines)
+
+        if not fetched_klines:
+            log(f"No new {symbol} {interval} klines fetched. Using cached data.")
+            df = cached_klines
+        else:
+            df = update_cached_klines(
+                pd.concat(fetched_klines, ignore_index=True),
+                symbol,
+                interval,
+                cache_dir,
+                cached_klines=cached_klines,
+            )
+
+    if df is None:
+        return None
 
-        if not klines:
-            break
-
-        all_klines.extend(klines)
-
-        start_str = klines[-1][0]
-        start_str_date = dt.utcfromtimestamp(start_str / 1000)
-        log(f"Fetch loop completed. Next start_str: {start_str_date}")
-
-        log(f"Progress: {iteration}/{total_iterations} iterations completed")
-        time.sleep(0.1)
-
-    df = pd.DataFrame(
-        all_klines,
-        columns=[
-            "open_time",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "close_time",
-            "quote_asset_volume",
-            "number_of_trades",
-            "taker_buy_base_asset_volume",
-            "taker_buy_quote_asset_volume",
-            "ignore",
-        ],
-    )
-    df["close"] = df["close"].astype(float)
-    df["high"] = df["high"].astype(float)
-    df["low"] = df["low"].astype(float)
+    if start_time is not None:
+        df = df[df["open_time"] >= start_time].reset_index(drop=True)
 
-    log(f"All {symbol} {interval} klines data fetched successfully.")
-    return df
+    return df.astype(KLINES_COLUMNS_DTYPES)
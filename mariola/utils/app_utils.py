@@ -1,67 +1,89 @@
 import json
 import pandas as pd
+from pathlib import Path
 from typing import Union, Optional, Callable
 from utils.logger_utils import log
 from utils.exception_handler import exception_handler
 
 
 @exception_handler()
-def save_data_to_csv(data: pd.DataFrame, filename: str) -> Optional[int]:
+def save_data(data: pd.DataFrame, filename: str) -> Optional[int]:
     """
-    Saves the provided data to a CSV file.
+    Saves the provided data to a Parquet or CSV file.
 
     This function takes a pandas DataFrame and saves it to a specified file.
-    It will not include the index in the saved CSV file by default.
+    It will not include the index in the saved file by default.
+    Filenames ending with '.parquet' are written as zstd-compressed Parquet,
+    which is much faster to write and read back than CSV and keeps column dtypes.
+    Other filenames are written as CSV.
 
     Parameters:
         data (pd.DataFrame): The DataFrame containing the data to be saved.
-        filename (str): The name or path of the CSV file to save the data to.
+        filename (str): The name or path of the '.parquet' or '.csv' file to save the data to.
 
     Returns:
         None: If the data is saved successfully, a message is printed confirming the save.
         If an error occurs during the save process, it will be caught and printed.
 
     Example:
-        >>> save_data_to_csv(df, 'data.csv')
-        Klines data saved to data.csv
+        >>> save_data(df, 'data.parquet')
+        Klines data saved to data.parquet
     """
     if data is None:
-        log(f"Error in save_data_to_csv. data id None.\n{data}")
+        log(f"Error in save_data. data id None.\n{data}")
         return None
 
-    data.to_csv(filename, index=False)
+    if str(filename).endswith(".parquet"):
+        data.to_parquet(filename, index=False, compression="zstd")
+    else:
+        data.to_csv(filename, index=False)
     log(f"Klines data saved to {filename}")
 
 
 @exception_handler()
-def load_data_from_csv(filename: str) -> Union[pd.DataFrame, Optional[int]]:
+def load_data(
+    filename: str, dtype: Optional[dict] = None
+) -> Union[pd.DataFrame, Optional[int]]:
     """
-    Loads data from a CSV file into a pandas DataFrame.
+    Loads data from a Parquet or CSV file into a pandas DataFrame.
 
-    This function reads the contents of a CSV file and loads it into a pandas DataFrame.
-    It assumes the file exists and is properly formatted as a CSV.
+    This function reads the contents of a file and loads it into a pandas DataFrame.
+    It assumes the file exists and is properly formatted.
+    Filenames ending with '.parquet' are read as Parquet. Other files are parsed as CSV
+    with the multithreaded pyarrow engine into regular NumPy-backed columns.
 
     Parameters:
-        filename (str): The name or path of the CSV file to load.
+        filename (str): The name or path of the '.parquet' or '.csv' file to load.
+        dtype (dict, optional): Column dtypes to load, e.g. OHLCV_DTYPES from df_utils.
+                                CSV columns are parsed directly into these dtypes, Parquet columns
+                                are cast after loading. Columns missing from the file are ignored.
 
     Returns:
-        pd.DataFrame: The loaded DataFrame containing the data from the CSV file.
+        pd.DataFrame: The loaded DataFrame containing the data from the file.
         If an error occurs, it will return None.
 
     Example:
-        >>> df = load_data_from_csv('data.csv')
-        Klines data loaded from data.csv
+        >>> df = load_data('data.parquet')
+        Klines data loaded from data.parquet
     """
     if not filename:
-        log("Error in load_data_from_csv. Filemane not provided")
+        log("Error in load_data. Filemane not provided")
         return None
 
-    df = pd.read_csv(filename)
+    if str(filename).endswith(".parquet"):
+        df = pd.read_parquet(filename)
+        if dtype:
+            df = df.astype(
+                {column: dtype[column] for column in dtype if column in df.columns}
+            )
+    else:
+        df = pd.read_csv(filename, engine="pyarrow", dtype=dtype)
     log(f"Klines data loaded from {filename}")
 
     return df
 
 
+
 @exception_handler()
 def save_df_info(df: pd.DataFrame, filename: str) -> Optional[int]:
     """
@@ -83,16 +105,14 @@ def save_df_info(df: pd.DataFrame, filename: str) -> Optional[int]:
     if df is None or df.empty or not filename:
         raise ValueError("df and filename must be provided and cannot be None.")
 
-    with open(filename, "w") as f:
-        f.write("Pandas DataFrame:\n")
-        f.write(str(df.columns) + "\n\n")
-        f.write("Number of Columns:\n")
-        f.write(str(len(df.columns)) + "\n\n")
-        f.write("Number of Rows:\n")
-        f.write(str(len(df)) + "\n\n")
-        f.write("Last 3 rows:\n")
-        f.write(df.tail(3).to_string(index=False))
-        log(f"DataFrame saved to {filename}")
+    df_info = (
+        f"Pandas DataFrame:\n{df.columns}\n\n"
+        f"Number of Columns:\n{len(df.columns)}\n\n"
+        f"Number of Rows:\n{len(df)}\n\n"
+        f"Last 3 rows:\n{df.iloc[-3:].to_string(index=False)}"
+    )
+    Path(filename).write_text(df_info)
+    log(f"DataFrame saved to {filename}")
 
 
 @exception_handler(default_return=exit)
@@ -144,7 +164,7 @@ def save_dataframe_with_info(
     >>> save_dataframe_with_info(df, 'data_calculated.csv', 'normalized')
     Data saved to data_normalized.csv.
     """
-    csv_filename = base_filename.replace("_calculated", f"_{stage_name}")
-    info_filename = csv_filename.replace("csv", "info")
+    stage_filename = base_filename.replace("_calculated", f"_{stage_name}")
+    info_filename = str(Path(stage_filename).with_suffix(".info"))
     save_df_info(dataframe, info_filename)
-    log(f"{stage_name.capitalize()} data saved to {csv_filename}.")
+    log(f"{stage_name.capitalize()} data saved to {stage_filename}.")
@@ -0,0 +1,260 @@
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pathlib import Path
+from typing import Optional
+from utils.logger_utils import log
+from utils.exception_handler import exception_handler
+
+KLINES_CACHE_DIR = "mariola/data/klines_cache"
+DF_CACHE_DIR = "mariola/data/df_cache"
+DF_CACHE_MAX_ENTRIES = 8
+CACHE_COMPRESSION = "zstd"
+
+_year_partitioning = ds.partitioning(pa.schema([("year", pa.int32())]), flavor="hive")
+
+
+def get_klines_cache_path(
+    symbol: str, interval: str, cache_dir: str = KLINES_CACHE_DIR
+) -> Path:
+    """
+    Returns the directory of the cached klines dataset for a symbol and interval.
+
+    The cache is a hive-partitioned Parquet dataset laid out as
+    'symbol=<symbol>/interval=<interval>/year=<year>/'.
+
+    Args:
+        symbol (str): The trading pair symbol, e.g., 'BTCUSDC'.
+        interval (str): The kline interval, e.g., '1h'.
+        cache_dir (str): The root directory of the klines cache.
+
+    Returns:
+        Path: The directory holding the cached klines for the symbol and interval.
+    """
+    return Path(cache_dir) / f"symbol={symbol}" / f"interval={interval}"
+
+
+@exception_handler()
+def load_cached_klines(
+    symbol: str, interval: str, cache_dir: str = KLINES_CACHE_DIR
+) -> Optional[pd.DataFrame]:
+    """
+    Loads cached klines for a symbol and interval from the Parquet cache.
+
+    Args:
+        symbol (str): The trading pair symbol, e.g., 'BTCUSDC'.
+        interval (str): The kline interval, e.g., '1h'.
+        cache_dir (str): The root directory of the klines cache.
+
+    Returns:
+        pd.DataFrame: The cached klines sorted by open_time,
+                      with the same columns as returned by get_full_historical_klines.
+        None: If nothing is cached for the symbol and interval.
+    """
+    cache_path = get_klines_cache_path(symbol, interval, cache_dir)
+    if not cache_path.exists():
+        return None
+
+    dataset = ds.dataset(cache_path, format="parquet", partitioning=_year_partitioning)
+    df = dataset.to_table().to_pandas().drop(columns="year")
+    if df.empty:
+        return None
+
+    df = df.sort_values("open_time", ignore_index=True)
+    log(f"{len(df)} cached {symbol} {interval} klines loaded from {cache_path}")
+
+    return df
+
+
+@exception_handler()
+def save_klines_to_cache(
+    df: pd.DataFrame, symbol: str, interval: str, cache_dir: str = KLINES_CACHE_DIR
+) -> None:
+    """
+    Saves klines to the Parquet cache, partitioned by the year of open_time.
+
+    Only the yearly partitions present in the DataFrame are rewritten,
+    older partitions stay untouched.
+
+    Args:
+        df (pd.DataFrame): The klines to cache, as returned by get_full_historical_klines.
+        symbol (str): The trading pair symbol, e.g., 'BTCUSDC'.
+        interval (str): The kline interval, e.g., '1h'.
+        cache_dir (str): The root directory of the klines cache.
+
+    Returns:
+        None
+    """
+    if df is None or df.empty:
+        log(f"Error in save_klines_to_cache. No {symbol} {interval} klines to cache.")
+        return None
+
+    cache_path = get_klines_cache_path(symbol, interval, cache_dir)
+    years = pd.to_datetime(df["open_time"], unit="ms").dt.year.to_numpy(np.int32)
+    table = pa.Table.from_pandas(df.assign(year=years), preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        cache_path,
+        format="parquet",
+        partitioning=_year_partitioning,
+        existing_data_behavior="delete_matching",
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression=CACHE_COMPRESSION
+        ),
+    )
+    log(f"{len(df)} {symbol} {interval} klines cached to {cache_path}")
+
+
+@exception_handler()
+def update_cached_klines(
+    new_klines: pd.DataFrame,
+    symbol: str,
+    interval: str,
+    cache_dir: str = KLINES_CACHE_DIR,
+    cached_klines: Optional[pd.DataFrame] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Merges new klines into the Parquet cache and returns the merged klines.
+
+    Klines already cached under the same open_time are replaced by the new ones.
+    Only the yearly partitions that contain new klines are rewritten, with all of
+    their merged klines, so the other partitions stay untouched.
+
+    Args:
+        new_klines (pd.DataFrame): The fetched klines, as returned by get_full_historical_klines.
+        symbol (str): The trading pair symbol, e.g., 'BTCUSDC'.
+        interval (str): The kline interval, e.g., '1h'.
+        cache_dir (str): The root directory of the klines cache.
+        cached_klines (pd.DataFrame, optional): The klines already loaded from the cache.
+                                                If not provided, they are loaded here.
+
+    Returns:
+        pd.DataFrame: The cached and new klines merged and sorted by open_time.
+        None: If an error occurs.
+    """
+    if cached_klines is None:
+        cached_klines = load_cached_klines(symbol, interval, cache_dir)
+
+    df = (
+        pd.concat([cached_klines, new_klines], ignore_index=True)
+        .drop_duplicates(subset="open_time", keep="last")
+        .sort_values("open_time", ignore_index=True)
+    )
+
+    changed_years = pd.to_datetime(new_klines["open_time"], unit="ms").dt.year.unique()
+    years = pd.to_datetime(df["open_time"], unit="ms").dt.year
+    save_klines_to_cache(df[years.isin(changed_years)], symbol, interval, cache_dir)
+
+    return df
+
+
+@exception_handler()
+def get_df_cache_key(
+    data_filename: str,
+    settings: dict,
+    features_version: str = "",
+    settings_keys: Optional[list] = None,
+) -> Optional[str]:
+    """
+    Returns a cache key for a DataFrame calculated from a data file with given settings.
+
+    The key is a SHA-256 digest of the data file contents, the settings serialized
+    with sorted keys and the features version, so it changes whenever the input data,
+    any setting used by the calculation or the feature calculation code changes.
+
+    Args:
+        data_filename (str): The path to the input data file.
+        settings (dict): The settings used to calculate the DataFrame.
+        features_version (str): The version of the feature calculation code,
+                                e.g. DF_FEATURES_VERSION from df_utils.
+        settings_keys (list, optional): The settings used by the calculation,
+                                        e.g. DF_SETTINGS_KEYS from df_utils. Other settings
+                                        do not change the key. If not provided,
+                                        all settings are used.
+
+    Returns:
+        str: The hexadecimal cache key.
+        None: If the data file cannot be read.
+    """
+    if settings_keys is not None:
+        settings = {key: settings.get(key) for key in settings_keys}
+
+    digest = hashlib.sha256()
+    with open(data_filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    digest.update(features_version.encode())
+
+    return digest.hexdigest()
+
+
+@exception_handler()
+def load_cached_df(
+    cache_key: str, cache_dir: str = DF_CACHE_DIR
+) -> Optional[pd.DataFrame]:
+    """
+    Loads a previously calculated DataFrame from the Parquet cache.
+
+    Args:
+        cache_key (str): The cache key returned by get_df_cache_key.
+        cache_dir (str): The directory of the DataFrame cache.
+
+    Returns:
+        pd.DataFrame: The cached DataFrame.
+        None: If no DataFrame is cached under the key.
+    """
+    cache_filename = Path(cache_dir) / f"{cache_key}.parquet"
+    if not cache_filename.exists():
+        return None
+
+    df = pd.read_parquet(cache_filename)
+    cache_filename.touch()
+    log(f"Calculated DataFrame loaded from cache {cache_filename}")
+
+    return df
+
+
+@exception_handler()
+def save_df_to_cache(
+    df: pd.DataFrame,
+    cache_key: str,
+    cache_dir: str = DF_CACHE_DIR,
+    max_entries: int = DF_CACHE_MAX_ENTRIES,
+) -> None:
+    """
+    Saves a calculated DataFrame to the Parquet cache under the given key.
+
+    The cache keeps at most max_entries DataFrames. The least recently used entries
+    (by modification time, refreshed on every cache hit) are removed after saving.
+
+    Args:
+        df (pd.DataFrame): The calculated DataFrame.
+        cache_key (str): The cache key returned by get_df_cache_key.
+        cache_dir (str): The directory of the DataFrame cache.
+        max_entries (int): The maximum number of cached DataFrames to keep.
+
+    Returns:
+        None
+    """
+    if df is None:
+        log("Error in save_df_to_cache. df is None.")
+        return None
+
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    cache_filename = Path(cache_dir) / f"{cache_key}.parquet"
+    df.to_parquet(cache_filename, index=False, compression=CACHE_COMPRESSION)
+    log(f"Calculated DataFrame cached to {cache_filename}")
+
+    cached_files = sorted(
+        Path(cache_dir).glob("*.parquet"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for stale_filename in cached_files[max_entries:]:
+        stale_filename.unlink(missing_ok=True)
+        log(f"Stale calculated DataFrame removed from cache {stale_filename}")
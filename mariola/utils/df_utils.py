@@ -1,9 +1,56 @@
+import hashlib
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import Union, Optional
 import talib
 from utils.exception_handler import exception_handler
 
+DF_FEATURES_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+DF_SETTINGS_KEYS = [
+    "regression",
+    "classification",
+    "general_timeperiod",
+    "bollinger_timeperiod",
+    "bollinger_nbdev",
+    "macd_timeperiod",
+    "macd_signalperiod",
+    "ema_fast_timeperiod",
+    "ema_slow_timeperiod",
+    "rsi_buy_value",
+    "rsi_sell_value",
+    "lag_period",
+    "marker_periods",
+    "success_threshold",
+    "drop_threshold",
+]
+
+OHLCV_COLUMNS = ["open", "low", "high", "close", "volume"]
+OHLCV_DTYPES = dict.fromkeys(OHLCV_COLUMNS, np.float64)
+
+HOUR_SIN = np.sin(2 * np.pi * np.arange(24) / 24)
+HOUR_COS = np.cos(2 * np.pi * np.arange(24) / 24)
+WEEKDAY_SIN = np.sin(2 * np.pi * np.arange(7) / 7)
+WEEKDAY_COS = np.cos(2 * np.pi * np.arange(7) / 7)
+MONTH_SIN = np.sin(2 * np.pi * np.arange(13) / 12)
+MONTH_COS = np.cos(2 * np.pi * np.arange(13) / 12)
+
+
+def _safe_pct(values: np.ndarray, base: np.ndarray) -> np.ndarray:
+    """
+    Returns the percentage difference (values - base) / base * 100 as a new array.
+
+    The difference is written into one preallocated array and divided in place,
+    rows where base is 0 are left at 0 instead of becoming inf.
+    """
+    nonzero_base = base != 0
+    pct = np.zeros(len(base), dtype=np.float64)
+    np.subtract(values, base, out=pct, where=nonzero_base)
+    np.divide(pct, base, out=pct, where=nonzero_base)
+    pct *= 100
+    return pct
+
 
 @exception_handler()
 def find_ml_hammer_patterns(df: pd.DataFrame) -> Union[pd.DataFrame, Optional[int]]:
@@ -21,7 +68,9 @@ def find_ml_hammer_patterns(df: pd.DataFrame) -> Union[pd.DataFrame, Optional[in
     - 'is_hammer_weekend': Boolean indicating if the Hammer pattern occurred on a weekend (Saturday or Sunday).
 
     Args:
-        df (pandas.DataFrame): DataFrame containing candlestick data (open, high, low, close, close_time).
+        df (pandas.DataFrame): DataFrame containing candlestick data (open, high, low, close)
+                               and the 'is_morning' and 'is_weekend' columns added by
+                               calculate_ml_time_patterns.
 
     Returns:
         pandas.DataFrame or None: DataFrame with the 'hammer', 'is_hammer_morning',
@@ -34,17 +83,19 @@ def find_ml_hammer_patterns(df: pd.DataFrame) -> Union[pd.DataFrame, Optional[in
     if df is None or df.empty:
         raise ValueError("df must be provided and cannot be None or empty.")
 
+    open_, high, low, close = df[["open", "high", "low", "close"]].to_numpy().T
+
+    candle_range = high - low
     df["hammer"] = (
-        ((df["high"] - df["close"]) > 2 * (df["open"] - df["low"]))
-        & ((df["close"] - df["low"]) / (df["high"] - df["low"]) > 0.6)
-        & ((df["open"] - df["low"]) / (df["high"] - df["low"]) > 0.6)
+        (candle_range > 0)
+        & ((high - close) > 2 * (open_ - low))
+        & ((close - low) > 0.6 * candle_range)
+        & ((open_ - low) > 0.6 * candle_range)
     )
 
-    df["is_hammer_morning"] = (
-        df["hammer"] & (df["close_time_hour"] >= 9) & (df["close_time_hour"] <= 12)
-    )
+    df["is_hammer_morning"] = df["hammer"] & df["is_morning"]
 
-    df["is_hammer_weekend"] = df["hammer"] & df["close_time_weekday"].isin([5, 6])
+    df["is_hammer_weekend"] = df["hammer"] & df["is_weekend"]
 
     return df
 
@@ -67,7 +118,9 @@ def find_ml_morning_star_patterns(
     - 'is_morning_star_weekend': Boolean indicating if the Morning Star pattern occurred on a weekend (Saturday or Sunday).
 
     Args:
-        df (pandas.DataFrame): DataFrame containing candlestick data (open, close, close_time).
+        df (pandas.DataFrame): DataFrame containing candlestick data (open, close)
+                               and the 'is_morning' and 'is_weekend' columns added by
+                               calculate_ml_time_patterns.
 
     Returns:
         pandas.DataFrame or None: DataFrame with the 'morning_star', 'is_morning_star_morning',
@@ -80,21 +133,19 @@ def find_ml_morning_star_patterns(
     if df is None or df.empty:
         raise ValueError("df must be provided and cannot be None or empty.")
 
-    df["morning_star"] = (
-        (df["close"].shift(2) < df["open"].shift(2))
-        & (df["open"].shift(1) < df["close"].shift(1))
-        & (df["close"] > df["open"])
-    )
+    open_, close = df[["open", "close"]].to_numpy().T
 
-    df["is_morning_star_morning"] = (
-        df["morning_star"]
-        & (df["close_time_hour"] >= 9)
-        & (df["close_time_hour"] <= 12)
+    morning_star = np.zeros(len(df), dtype=bool)
+    morning_star[2:] = (
+        (close[:-2] < open_[:-2])
+        & (open_[1:-1] < close[1:-1])
+        & (close[2:] > open_[2:])
     )
+    df["morning_star"] = morning_star
 
-    df["is_morning_star_weekend"] = df["morning_star"] & df["close_time_weekday"].isin(
-        [5, 6]
-    )
+    df["is_morning_star_morning"] = df["morning_star"] & df["is_morning"]
+
+    df["is_morning_star_weekend"] = df["morning_star"] & df["is_weekend"]
 
     return df
 
@@ -117,7 +168,9 @@ def find_ml_bullish_engulfing_patterns(
     - 'is_bullish_engulfing_weekend': Boolean indicating if the Bullish Engulfing pattern occurred on a weekend (Saturday or Sunday).
 
     Args:
-        df (pandas.DataFrame): DataFrame containing candlestick data (open, close, close_time).
+        df (pandas.DataFrame): DataFrame containing candlestick data (open, close)
+                               and the 'is_morning' and 'is_weekend' columns added by
+                               calculate_ml_time_patterns.
 
     Returns:
         pandas.DataFrame or None: DataFrame with the 'bullish_engulfing', 'is_bullish_engulfing_morning',
@@ -130,22 +183,20 @@ def find_ml_bullish_engulfing_patterns(
     if df is None or df.empty:
         raise ValueError("df must be provided and cannot be None or empty.")
 
-    df["bullish_engulfing"] = (
-        (df["open"].shift(1) > df["close"].shift(1))
-        & (df["open"] < df["close"])
-        & (df["open"] < df["close"].shift(1))
-        & (df["close"] > df["open"].shift(1))
-    )
+    open_, close = df[["open", "close"]].to_numpy().T
 
-    df["is_bullish_engulfing_morning"] = (
-        df["bullish_engulfing"]
-        & (df["close_time_hour"] >= 9)
-        & (df["close_time_hour"] <= 12)
+    bullish_engulfing = np.zeros(len(df), dtype=bool)
+    bullish_engulfing[1:] = (
+        (open_[:-1] > close[:-1])
+        & (open_[1:] < close[1:])
+        & (open_[1:] < close[:-1])
+        & (close[1:] > open_[:-1])
     )
+    df["bullish_engulfing"] = bullish_engulfing
 
-    df["is_bullish_engulfing_weekend"] = df["bullish_engulfing"] & df[
-        "close_time_weekday"
-    ].isin([5, 6])
+    df["is_bullish_engulfing_morning"] = df["bullish_engulfing"] & df["is_morning"]
+
+    df["is_bullish_engulfing_weekend"] = df["bullish_engulfing"] & df["is_weekend"]
 
     return df
 
@@ -159,6 +210,9 @@ def calculate_ml_pct_change_and_lags(
 
     This function iterates over a list of column names and performs the following operations:
     - Calculates the percentage change for each column and creates a new column for it.
+      The change is computed once from the column's NumPy values with _safe_pct, without
+      forward-filling missing values as Series.pct_change does; a zero previous value gives 0
+      instead of inf.
     - Generates lagged versions of each column for a range of lag values (from 'lag_min' to 'lag_max'
       as specified).
 
@@ -177,9 +231,13 @@ def calculate_ml_pct_change_and_lags(
         Exception: If an error occurs during the calculation of percentage change or lag features for any column.
     """
     for column_name in column_names_list:
+        values = df[column_name].to_numpy(dtype=np.float64)
+
+        pct_change = np.full(len(values), np.nan)
+        pct_change[1:] = _safe_pct(values[1:], values[:-1])
+        df[f"{column_name}_pct_change"] = pct_change
 
-        df[f"{column_name}_pct_change"] = df[f"{column_name}"].pct_change() * 100
-        df[f"{column_name}_lag_{lag_period}"] = df[f"{column_name}"].shift(lag_period)
+        df[f"{column_name}_lag_{lag_period}"] = df[column_name].shift(lag_period)
 
     return df
 
@@ -194,6 +252,7 @@ def calculate_ml_momentum_signals(
     This function calculates whether a price is in support or resistance based on a rolling window,
     and adds boolean columns indicating the direction of momentum (positive or negative).
     It also adds a signal for trend reversal, defined when the sign of the close price change reverses.
+    The reversal is computed on adjacent NumPy slices instead of a shifted Series copy.
 
     Args:
         df (pandas.DataFrame): The DataFrame containing the candlestick data.
@@ -203,19 +262,18 @@ def calculate_ml_momentum_signals(
         pandas.DataFrame or None: The DataFrame with the added momentum-related signals.
                                    Returns None if an error occurs during the calculation.
     """
-    df["is_support"] = (
-        df["close"] == df["close"].rolling(window=general_timeperiod).min()
-    )
-    df["is_resistance"] = (
-        df["close"] == df["close"].rolling(window=general_timeperiod).max()
-    )
+    close = df["close"].to_numpy()
+    close_rolling = df["close"].rolling(window=general_timeperiod)
+    df["is_support"] = close == close_rolling.min().to_numpy()
+    df["is_resistance"] = close == close_rolling.max().to_numpy()
 
-    df["momentum_positive"] = df["close_pct_change"] > 0
-    df["momentum_negative"] = df["close_pct_change"] < 0
+    close_pct_change = df["close_pct_change"].to_numpy()
+    df["momentum_positive"] = close_pct_change > 0
+    df["momentum_negative"] = close_pct_change < 0
 
-    df["trend_reversal_signal"] = (
-        df["close_pct_change"].shift(1) * df["close_pct_change"] < 0
-    )
+    trend_reversal = np.zeros(len(close_pct_change), dtype=np.bool_)
+    trend_reversal[1:] = close_pct_change[:-1] * close_pct_change[1:] < 0
+    df["trend_reversal_signal"] = trend_reversal
 
     return df
 
@@ -240,16 +298,12 @@ def calculate_ml_rsi(
         pandas.DataFrame or None: The DataFrame with the calculated RSI and buy/sell signals.
                                    Returns None if an error occurs during the calculation.
     """
-    df[f"rsi_{general_timeperiod}"] = talib.RSI(
-        df["close"], timeperiod=general_timeperiod
-    )
+    close = df["close"].to_numpy(dtype=np.float64)
+    rsi = talib.RSI(close, timeperiod=general_timeperiod)
 
-    df[f"rsi_{general_timeperiod}_buy_signal"] = (
-        df[f"rsi_{general_timeperiod}"] < rsi_buy_value
-    )
-    df[f"rsi_{general_timeperiod}_sell_signal"] = (
-        df[f"rsi_{general_timeperiod}"] > rsi_sell_value
-    )
+    df[f"rsi_{general_timeperiod}"] = rsi
+    df[f"rsi_{general_timeperiod}_buy_signal"] = rsi < rsi_buy_value
+    df[f"rsi_{general_timeperiod}_sell_signal"] = rsi > rsi_sell_value
 
     return df
 
@@ -273,20 +327,14 @@ def calculate_ml_ema(
         pandas.DataFrame or None: The DataFrame with the calculated EMAs and buy/sell signals.
                                    Returns None if an error occurs during the calculation.
     """
-    df[f"ema_{ema_fast_timeperiod}"] = talib.EMA(
-        df["close"], timeperiod=ema_fast_timeperiod
-    )
+    close = df["close"].to_numpy(dtype=np.float64)
+    ema_fast = talib.EMA(close, timeperiod=ema_fast_timeperiod)
+    ema_slow = talib.EMA(close, timeperiod=ema_slow_timeperiod)
 
-    df[f"ema_{ema_slow_timeperiod}"] = talib.EMA(
-        df["close"], timeperiod=ema_slow_timeperiod
-    )
-
-    df["ema_buy_signal"] = (
-        df[f"ema_{ema_fast_timeperiod}"] > df[f"ema_{ema_slow_timeperiod}"]
-    )
-    df["ema_sell_signal"] = (
-        df[f"ema_{ema_fast_timeperiod}"] < df[f"ema_{ema_slow_timeperiod}"]
-    )
+    df[f"ema_{ema_fast_timeperiod}"] = ema_fast
+    df[f"ema_{ema_slow_timeperiod}"] = ema_slow
+    df["ema_buy_signal"] = ema_fast > ema_slow
+    df["ema_sell_signal"] = ema_fast < ema_slow
 
     return df
 
@@ -299,7 +347,8 @@ def calculate_ml_macd(
     Calculates the Moving Average Convergence Divergence (MACD) and generates buy/sell signals.
 
     This function calculates the MACD and its signal line, and generates buy/sell signals based on
-    the MACD line crossing above or below the signal line. It also calculates the MACD histogram.
+    the MACD line crossing above or below the signal line. The MACD histogram is taken directly
+    from the third TA-Lib output instead of being recomputed.
 
     Args:
         df (pandas.DataFrame): The DataFrame containing the candlestick data.
@@ -310,25 +359,20 @@ def calculate_ml_macd(
         pandas.DataFrame or None: The DataFrame with the calculated MACD and buy/sell signals.
                                    Returns None if an error occurs during the calculation.
     """
-    df[f"macd_{macd_timeperiod}"], df[f"macd_signal_{macd_signalperiod}"], _ = (
-        talib.MACD(
-            df["close"],
-            fastperiod=macd_timeperiod,
-            slowperiod=macd_timeperiod * 2,
-            signalperiod=macd_signalperiod,
-        )
+    close = df["close"].to_numpy(dtype=np.float64)
+    macd, macd_signal, macd_histogram = talib.MACD(
+        close,
+        fastperiod=macd_timeperiod,
+        slowperiod=macd_timeperiod * 2,
+        signalperiod=macd_signalperiod,
     )
 
-    df[f"macd_histogram_{macd_timeperiod}"] = (
-        df[f"macd_{macd_timeperiod}"] - df[f"macd_signal_{macd_signalperiod}"]
-    )
+    df[f"macd_{macd_timeperiod}"] = macd
+    df[f"macd_signal_{macd_signalperiod}"] = macd_signal
+    df[f"macd_histogram_{macd_timeperiod}"] = macd_histogram
 
-    df["macd_buy_signal"] = (
-        df[f"macd_{macd_timeperiod}"] > df[f"macd_signal_{macd_signalperiod}"]
-    )
-    df["macd_sell_signal"] = (
-        df[f"macd_{macd_timeperiod}"] < df[f"macd_signal_{macd_signalperiod}"]
-    )
+    df["macd_buy_signal"] = macd > macd_signal
+    df["macd_sell_signal"] = macd < macd_signal
 
     return df
 
@@ -352,16 +396,20 @@ def calculate_ml_bollinger_bands(
         pandas.DataFrame or None: The DataFrame with the calculated Bollinger Bands and buy/sell signals.
                                    Returns None if an error occurs during the calculation.
     """
-    df["upper_band"], df["middle_band"], df["lower_band"] = talib.BBANDS(
-        df["close"],
+    close = df["close"].to_numpy(dtype=np.float64)
+    upper_band, middle_band, lower_band = talib.BBANDS(
+        close,
         timeperiod=bollinger_timeperiod,
         nbdevup=bollinger_nbdev,
         nbdevdn=bollinger_nbdev,
         matype=0,
     )
 
-    df["bollinger_buy_signal"] = df["close"] < df["lower_band"]
-    df["bollinger_sell_signal"] = df["close"] > df["upper_band"]
+    df["upper_band"] = upper_band
+    df["middle_band"] = middle_band
+    df["lower_band"] = lower_band
+    df["bollinger_buy_signal"] = close < lower_band
+    df["bollinger_sell_signal"] = close > upper_band
 
     return df
 
@@ -372,10 +420,15 @@ def calculate_ml_time_patterns(df: pd.DataFrame) -> Union[pd.DataFrame, Optional
     Adds time-based features to the DataFrame based on the 'close_time' column.
 
     This function creates new features based on the 'close_time' column:
-    - Extracts the hour, weekday, and month from 'close_time'.
+    - Extracts the hour, weekday, and month from 'close_time' as int8 columns. The timestamp is
+      converted once and the fields are derived with NumPy datetime arithmetic
+      (1970-01-01 was a Thursday, weekday 3); the 'close_time' column itself is left unchanged.
     - Computes cyclic (sinusoidal and cosinusoidal) transformations for hour, weekday, and month
-      to capture cyclical patterns in time.
+      to capture cyclical patterns in time. The values are looked up in precomputed tables
+      (HOUR_SIN, WEEKDAY_SIN, MONTH_SIN, ...) instead of evaluating sin/cos for every row.
     - Adds a boolean feature indicating whether the 'close_time' corresponds to a weekend (Saturday or Sunday).
+    - Adds a boolean 'is_morning' helper column (9 AM to 12 PM) used by the candlestick
+      pattern functions; prepare_ml_df drops it before returning.
 
     Args:
         df (pandas.DataFrame): The DataFrame containing the 'close_time' column.
@@ -384,20 +437,28 @@ def calculate_ml_time_patterns(df: pd.DataFrame) -> Union[pd.DataFrame, Optional
         pandas.DataFrame or None: The DataFrame with additional time-based features.
                                    Returns None if an error occurs during the calculation.
     """
-    df["close_time"] = pd.to_datetime(df["close_time"], unit="ms")
+    close_time = pd.to_datetime(df["close_time"], unit="ms").to_numpy()
+    close_time_days = close_time.astype("datetime64[D]")
+
+    hour = ((close_time - close_time_days) // np.timedelta64(1, "h")).astype(np.int8)
+    weekday = ((close_time_days.astype(np.int64) + 3) % 7).astype(np.int8)
+    month = (
+        close_time.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    ).astype(np.int8)
 
-    df["close_time_hour"] = df["close_time"].dt.hour
-    df["close_time_weekday"] = df["close_time"].dt.weekday
-    df["close_time_month"] = df["close_time"].dt.month
+    df["close_time_hour"] = hour
+    df["close_time_weekday"] = weekday
+    df["close_time_month"] = month
 
-    df["hour_sin"] = np.sin(2 * np.pi * df["close_time_hour"] / 24)
-    df["hour_cos"] = np.cos(2 * np.pi * df["close_time_hour"] / 24)
-    df["weekday_sin"] = np.sin(2 * np.pi * df["close_time_weekday"] / 7)
-    df["weekday_cos"] = np.cos(2 * np.pi * df["close_time_weekday"] / 7)
-    df["month_sin"] = np.sin(2 * np.pi * df["close_time_month"] / 12)
-    df["month_cos"] = np.cos(2 * np.pi * df["close_time_month"] / 12)
+    df["hour_sin"] = HOUR_SIN[hour]
+    df["hour_cos"] = HOUR_COS[hour]
+    df["weekday_sin"] = WEEKDAY_SIN[weekday]
+    df["weekday_cos"] = WEEKDAY_COS[weekday]
+    df["month_sin"] = MONTH_SIN[month]
+    df["month_cos"] = MONTH_COS[month]
 
-    df["is_weekend"] = df["close_time_weekday"].isin([5, 6])
+    df["is_weekend"] = weekday >= 5
+    df["is_morning"] = (hour >= 9) & (hour <= 12)
 
     return df
 
@@ -437,9 +498,11 @@ def handle_initial_ml_df_preparaition(
     Prepares the initial DataFrame by converting specific columns to numeric types.
 
     This function ensures that the columns 'open', 'low', 'high', 'close', and 'volume'
-    in the given DataFrame are converted to numeric types. Non-numeric values are coerced
-    to NaN. If an exception occurs during processing, it is logged, and the function
-    returns None.
+    in the given DataFrame are converted to float64, as expected by TA-Lib (fetched
+    klines store them as float32). Columns that are already float64 are left untouched,
+    e.g. when the data was loaded with `load_data(filename, dtype=OHLCV_DTYPES)`.
+    Non-numeric values are coerced to NaN. If an exception occurs during processing,
+    it is logged, and the function returns None.
 
     Parameters:
         df (pandas.DataFrame): The input DataFrame containing market data with columns
@@ -452,11 +515,15 @@ def handle_initial_ml_df_preparaition(
     Raises:
         None: All exceptions are handled and logged internally.
     """
-    df["open"] = pd.to_numeric(df["open"], errors="coerce")
-    df["low"] = pd.to_numeric(df["low"], errors="coerce")
-    df["high"] = pd.to_numeric(df["high"], errors="coerce")
-    df["close"] = pd.to_numeric(df["close"], errors="coerce")
-    df["volume"] = pd.to_numeric(df["volume"], errors="coerce")
+    columns_to_convert = [
+        column for column in OHLCV_COLUMNS if df[column].dtype != np.float64
+    ]
+    if columns_to_convert:
+        df[columns_to_convert] = (
+            df[columns_to_convert]
+            .apply(pd.to_numeric, errors="coerce")
+            .astype(np.float64)
+        )
 
     return df
 
@@ -483,8 +550,10 @@ def add_ml_regression_etiquete(
     Raises:
         None: All exceptions are handled and logged internally.
     """
-    df[f"marker_close_pct_change_in_next_{marker_period}_periods"] = (
-        (df["close"].shift(-marker_period) - df["close"]) / df["close"] * 100
+    close = df["close"].to_numpy(dtype=np.float64)
+    future_close = df["close"].shift(-marker_period).to_numpy(dtype=np.float64)
+    df[f"marker_close_pct_change_in_next_{marker_period}_periods"] = _safe_pct(
+        future_close, close
     )
 
     return df
@@ -503,10 +572,12 @@ def add_ml_classification_etiquete(
     This function determines whether a trade is considered successful or not within
     the next specified number of periods based on the given success and drop thresholds.
     It adds a new boolean column to the DataFrame indicating trade success.
+    The maximum and minimum close over the next 'marker_period' periods are computed
+    here with a single rolling window (O(N)) and are not added to the DataFrame,
+    so they cannot leak future prices into the features.
 
     Parameters:
-        df (pandas.DataFrame): The input DataFrame containing columns for 'close',
-        'max_close_in_{marker_period}', and 'min_close_in_{marker_period}'.
+        df (pandas.DataFrame): The input DataFrame containing the 'close' column.
         marker_period (int): The number of periods to evaluate for trade success.
         success_threshold (float): The minimum percentage increase in the 'close' price
         for a trade to be considered successful.
@@ -521,13 +592,13 @@ def add_ml_classification_etiquete(
     Raises:
         None: All exceptions are handled and logged internally.
     """
+    close = df["close"].to_numpy(dtype=np.float64)
+    future_close = df["close"].astype(np.float64).rolling(window=marker_period)
+    max_close = future_close.max().shift(-marker_period).to_numpy()
+    min_close = future_close.min().shift(-marker_period).to_numpy()
     df[f"marker_close_trade_success_in_next_{marker_period}_periods"] = (
-        (df[f"max_close_in_{marker_period}"] - df["close"]) / df["close"] * 100
-        >= success_threshold
-    ) & (
-        (df[f"min_close_in_{marker_period}"] - df["close"]) / df["close"] * 100
-        > drop_threshold
-    )
+        _safe_pct(max_close, close) >= success_threshold
+    ) & (_safe_pct(min_close, close) > drop_threshold)
 
     return df
 
@@ -539,8 +610,13 @@ def handle_final_ml_df_cleaninig(
     """
     Performs final cleaning on the DataFrame.
 
-    This function removes specified columns, fills missing values with 0,
-    and converts boolean columns to integer type for further processing.
+    This function removes specified columns, fills missing values in the float columns
+    with 0 in one NumPy pass per float dtype, so float32 and float64 columns keep
+    their dtypes (infinite values are kept),
+    and converts boolean columns to uint8 (a zero-copy view of the bool values)
+    for further processing.
+    Columns are replaced rather than modified in place, so columns shared with
+    the input of prepare_ml_df (a shallow copy) are never written to.
 
     Parameters:
         df (pandas.DataFrame): The input DataFrame to be cleaned.
@@ -554,11 +630,48 @@ def handle_final_ml_df_cleaninig(
     Raises:
         None: All exceptions are handled and logged internally.
     """
-    df.drop(columns=columns_to_drop, inplace=True)
-    df.fillna(0, inplace=True)
-    df[df.select_dtypes(include=["bool"]).columns] = df.select_dtypes(
-        include=["bool"]
-    ).astype(int)
+    df.drop(columns=columns_to_drop, inplace=True, errors="ignore")
+    float_columns = df.select_dtypes(include=["floating"]).columns
+    float_dtypes = df.dtypes[float_columns]
+    for dtype in float_dtypes.unique():
+        columns = float_columns[float_dtypes == dtype]
+        df[columns] = np.nan_to_num(
+            df[columns].to_numpy(), nan=0.0, posinf=np.inf, neginf=-np.inf
+        )
+    bool_columns = df.select_dtypes(include=["bool"]).columns
+    if len(bool_columns):
+        df[bool_columns] = df[bool_columns].to_numpy().view(np.uint8)
+
+    return df
+
+
+@exception_handler()
+def downcast_ml_df_features(
+    df: pd.DataFrame, columns_to_keep: list
+) -> Union[pd.DataFrame, Optional[int]]:
+    """
+    Downcasts float64 feature columns to float32.
+
+    Derived features (indicators, ratios, pct changes, cyclic time features) do not need
+    float64 precision, and storing them as float32 halves their memory and the traffic of
+    the later normalization pass. Columns listed in columns_to_keep (raw OHLCV prices and
+    target markers) stay float64.
+
+    Parameters:
+        df (pandas.DataFrame): The input DataFrame with calculated features.
+        columns_to_keep (list): A list of column names that must stay float64.
+
+    Returns:
+        pandas.DataFrame: The DataFrame with float64 feature columns converted to float32.
+        Returns None if an exception occurs.
+
+    Raises:
+        None: All exceptions are handled and logged internally.
+    """
+    float_columns = df.select_dtypes(include=["float64"]).columns.difference(
+        columns_to_keep, sort=False
+    )
+    df[float_columns] = df[float_columns].astype(np.float32)
 
     return df
 
@@ -590,7 +703,7 @@ def prepare_ml_df(
     if df is None or df.empty:
         raise ValueError("df must be provided and cannot be None or empty.")
 
-    result = df.copy()
+    result = df.copy(deep=False)
 
     handle_initial_ml_df_preparaition(result)
 
@@ -636,6 +749,7 @@ def prepare_ml_df(
     columns_to_drop = [
         "open_time",
         "close_time",
+        "is_morning",
         "ignore",
         "quote_asset_volume",
         "number_of_trades",
@@ -644,4 +758,9 @@ def prepare_ml_df(
     ]
     handle_final_ml_df_cleaninig(result, columns_to_drop)
 
+    columns_to_keep = OHLCV_COLUMNS + [
+        column for column in result.columns if column.startswith("marker_")
+    ]
+    downcast_ml_df_features(result, columns_to_keep)
+
     return result
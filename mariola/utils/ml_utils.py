@@ -1,18 +1,71 @@
+import joblib
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.decomposition import PCA
+from typing import Optional, Union
+from utils.logger_utils import log
 from utils.exception_handler import exception_handler
 
+PCA_COMPONENTS = 50
+
+
+def create_scaler() -> MinMaxScaler:
+    """
+    Creates the unfitted MinMaxScaler used by normalize_df.
+
+    The scaler is created with copy=False, so it scales the float32 feature array
+    that normalize_df has already cleaned of infinite values in place,
+    without allocating another array of the same size.
+
+    Returns:
+        MinMaxScaler: A scaler with feature_range (0, 1).
+    """
+    return MinMaxScaler(feature_range=(0, 1), copy=False)
+
+
+def create_pca() -> PCA:
+    """
+    Creates the unfitted PCA used by handle_pca.
+
+    The components are computed with randomized SVD, which is much faster than a full SVD
+    for the PCA_COMPONENTS kept components. A fixed random_state keeps the result reproducible.
+
+    Returns:
+        PCA: A PCA keeping PCA_COMPONENTS components.
+    """
+    return PCA(n_components=PCA_COMPONENTS, svd_solver="randomized", random_state=0)
+
+
+def is_fitted(estimator: object) -> bool:
+    """
+    Checks whether a scikit-learn estimator has already been fitted.
+
+    Args:
+        estimator (object): The estimator to check, e.g., a MinMaxScaler or PCA.
+
+    Returns:
+        bool: True if the estimator has been fitted, False otherwise.
+    """
+    return hasattr(estimator, "n_features_in_")
+
 
 @exception_handler()
 def normalize_df(
-    df: pd.DataFrame = None, training_mode: bool = True, result_marker: str = None
+    df: pd.DataFrame = None,
+    training_mode: bool = True,
+    result_marker: str = None,
+    scaler: Optional[MinMaxScaler] = None,
 ) -> pd.DataFrame:
     """
-    Normalize the numeric columns in a DataFrame using MinMaxScaler, while replacing infinite values
-    and clipping extreme values. Non-numeric columns are excluded from normalization, and the
+    Normalize the numeric columns in a DataFrame using MinMaxScaler, while replacing infinite values.
+    All numeric dtypes (including compact int8/float32 columns) are normalized. The features are
+    scaled as a single float32 array, so the normalized columns are float32.
+    Non-numeric columns are excluded from normalization, and the
     `result_marker` column (if specified) is retained without modification.
+    Target columns (`result_marker` and any 'marker_*' column) are never used as features,
+    so a scaler fitted during training matches the columns available at prediction time.
 
     Args:
         df (pd.DataFrame): The input DataFrame containing both numeric and non-numeric columns.
@@ -21,14 +74,20 @@ def normalize_df(
                                and included in the final output.
         result_marker (str): The name of the column to retain in the final DataFrame without modification.
                              If None, no column is retained.
+        scaler (MinMaxScaler, optional): The scaler to use. An unfitted scaler is fitted in place,
+                                         so the caller can persist it after training.
+                                         An already fitted scaler (e.g., loaded with
+                                         load_preprocessors) is only applied with transform.
+                                         If None, a new scaler is created and fitted.
 
     Returns:
         pd.DataFrame: A DataFrame with normalized numeric columns and the `result_marker` column added
                       at the end, if specified.
 
     Raises:
-        ValueError: If `df` is `None`, empty, or if `result_marker` is specified but not found
-                    in the DataFrame columns.
+        ValueError: If `df` is `None`, empty, if `result_marker` is specified but not found
+                    in the DataFrame columns, or if a fitted scaler expects a different
+                    number of features than `df` provides.
     """
     if df is None or df.empty:
         raise ValueError("df must be provided and cannot be None.")
@@ -42,21 +101,38 @@ def normalize_df(
         include=["bool", "datetime", "string"]
     ).columns.tolist()
 
-    numeric_features = df.select_dtypes(include=["float64", "int64"]).columns.tolist()
+    numeric_features = df.select_dtypes(include=["number"]).columns.tolist()
+
+    numeric_features = [
+        column
+        for column in numeric_features
+        if column != result_marker and not column.startswith("marker_")
+    ]
+
+    if scaler is None:
+        scaler = create_scaler()
+
+    if is_fitted(scaler) and scaler.n_features_in_ != len(numeric_features):
+        raise ValueError(
+            f"The fitted scaler expects {scaler.n_features_in_} features, "
+            f"but df has {len(numeric_features)} numeric feature columns. "
+            f"The data must be prepared with the same settings as during training."
+        )
 
-    if training_mode and result_marker in numeric_features:
-        numeric_features.remove(result_marker)
+    features = df[numeric_features].to_numpy(dtype=np.float32)
+    np.nan_to_num(features, copy=False, nan=np.nan, posinf=0.0, neginf=0.0)
 
-    df = df.replace([np.inf, -np.inf], 0)
-    df[numeric_features] = df[numeric_features].clip(lower=-1.8e308, upper=1.8e308)
+    if is_fitted(scaler):
+        features = scaler.transform(features)
+    else:
+        features = scaler.fit_transform(features)
 
-    scaler = MinMaxScaler(feature_range=(0, 1))
-    df_normalized = pd.DataFrame(
-        scaler.fit_transform(df[numeric_features]), columns=numeric_features
-    )
+    df_normalized = pd.DataFrame(features, columns=numeric_features, copy=False)
 
     if training_mode and result_marker:
-        df_normalized[result_marker] = df[result_marker].values
+        df_normalized[result_marker] = (
+            df[result_marker].replace([np.inf, -np.inf], 0).to_numpy()
+        )
 
     return df_normalized
 
@@ -66,27 +142,48 @@ def handle_pca(
     df_normalized: pd.DataFrame = None,
     loaded_df: pd.DataFrame = None,
     result_marker: str = None,
+    pca: Optional[PCA] = None,
 ) -> pd.DataFrame:
     """
     Perform Principal Component Analysis (PCA) on the normalized DataFrame and add the target marker to the resulting DataFrame.
 
+    The PCA is fitted on a float32 array with randomized SVD (see create_pca),
+    and the reduced features are always returned as float32.
+    The `result_marker` column is excluded from the PCA input, so the same fitted PCA
+    can be applied at prediction time, when the marker is not available.
+
     Args:
         df_normalized (pd.DataFrame): The normalized DataFrame containing only numeric features.
         loaded_df (pd.DataFrame): The original DataFrame containing the target marker.
         result_marker (str): The name of the column in `loaded_df` representing the target marker.
+        pca (PCA, optional): The PCA to use. An unfitted PCA is fitted in place, so the caller
+                             can persist it after training. An already fitted PCA (e.g., loaded
+                             with load_preprocessors) is only applied with transform.
+                             If None, a new PCA is created and fitted.
 
     Returns:
         pd.DataFrame: A DataFrame with the reduced features (after PCA) and the target marker.
+                      The marker is attached by position, so `loaded_df` may have any index.
     """
     if df_normalized is None or df_normalized.empty:
         raise ValueError("df_normalized must be provided and cannot be None.")
 
-    pca = PCA(n_components=50)
-    df_reduced = pca.fit_transform(df_normalized)
-    df_reduced = pd.DataFrame(df_reduced)
+    if pca is None:
+        pca = create_pca()
+
+    df_features = df_normalized
+    if result_marker:
+        df_features = df_normalized.drop(columns=[result_marker], errors="ignore")
+
+    features = df_features.to_numpy(dtype=np.float32)
+    if is_fitted(pca):
+        df_reduced = pca.transform(features)
+    else:
+        df_reduced = pca.fit_transform(features)
+    df_reduced = pd.DataFrame(df_reduced.astype(np.float32, copy=False), copy=False)
 
     if result_marker and result_marker in loaded_df.columns:
-        df_reduced[result_marker] = loaded_df[result_marker]
+        df_reduced[result_marker] = loaded_df[result_marker].to_numpy()
 
     return df_reduced
 
@@ -98,7 +195,7 @@ def create_sequences(
     window_size: int = None,
     result_marker: str = None,
     training_mode: bool = False,
-) -> tuple[np.ndarray, np.ndarray]:
+) -> Union[tuple[np.ndarray, np.ndarray], np.ndarray]:
     """
     Create sequences of features and corresponding target labels from the reduced DataFrame for time series prediction.
 
@@ -111,16 +208,18 @@ def create_sequences(
                                If False, only generates feature sequences (X) without labels.
 
     Returns:
-        tuple:
+        tuple: If `training_mode=True`:
             - X (numpy.ndarray): Array of feature sequences of shape (num_samples, window_size, num_features).
-            - y (numpy.ndarray, optional): Array of target labels corresponding to each feature sequence.
-              Only returned if `training_mode=True`.
+            - y (numpy.ndarray): Array of target labels corresponding to each feature sequence.
+        numpy.ndarray: If `training_mode=False`, only X.
 
     Notes:
         - The function extracts sequences of length `window_size` from `df_reduced` for the features.
           For each sequence, it uses the `lookback` value to determine the target label.
         - If `training_mode` is set to `False`, the function returns only the feature sequences (X) and does not generate target labels (y).
         - If any of the arguments are missing or `None`, the function raises a `ValueError`.
+        - X is built with `sliding_window_view` as a read-only float32 view over the feature array,
+          without a Python loop or per-window copies.
     """
     if (
         df_reduced is None
@@ -130,18 +229,63 @@ def create_sequences(
     ):
         raise ValueError("All arguments must be provided and cannot be None.")
 
-    X = []
-    y = [] if training_mode else None
-
     df_features = df_reduced
 
     if training_mode:
         df_features = df_reduced.drop(columns=[result_marker])
 
-    for i in range(window_size, len(df_reduced) - lookback):
-        X.append(df_features.iloc[i - window_size : i].values)
+    features = df_features.to_numpy(dtype=np.float32)
+    num_samples = max(len(df_reduced) - lookback - window_size, 0)
+
+    if num_samples:
+        X = sliding_window_view(features, window_size, axis=0)[:num_samples]
+        X = X.transpose(0, 2, 1)
+    else:
+        X = np.empty((0, window_size, features.shape[1]), dtype=features.dtype)
+
+    if training_mode:
+        first_target = window_size + lookback
+        y = df_reduced[result_marker].to_numpy()[
+            first_target : first_target + num_samples
+        ]
+        return X, y
+
+    return X
+
+
+@exception_handler()
+def save_preprocessors(scaler: MinMaxScaler, pca: PCA, filename: str) -> None:
+    """
+    Saves the fitted scaler and PCA used to prepare the model input.
+
+    Args:
+        scaler (MinMaxScaler): The scaler fitted by normalize_df during training.
+        pca (PCA): The PCA fitted by handle_pca during training.
+        filename (str): The path of the .joblib file to save.
+
+    Returns:
+        None
+    """
+    joblib.dump((scaler, pca), filename)
+    log(f"Fitted scaler and PCA saved to {filename}")
+
+
+@exception_handler()
+def load_preprocessors(filename: str) -> Optional[tuple[MinMaxScaler, PCA]]:
+    """
+    Loads the fitted scaler and PCA saved by save_preprocessors.
 
-        if training_mode:
-            y.append(df_reduced.iloc[i + lookback][result_marker])
+    Passing them to normalize_df and handle_pca applies the training-time
+    transformation without fitting anything again.
+
+    Args:
+        filename (str): The path of the .joblib file to load.
+
+    Returns:
+        tuple: The fitted (scaler, pca).
+        None: If an error occurs, e.g., the file does not exist.
+    """
+    scaler, pca = joblib.load(filename)
+    log(f"Fitted scaler and PCA loaded from {filename}")
 
-    return np.array(X), np.array(y) if training_mode else np.array(X)
+    return scaler, pca
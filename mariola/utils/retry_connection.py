@@ -1,21 +1,29 @@
 import time
+import functools
 import requests
 import smtplib
 from binance.exceptions import BinanceAPIException
-from app.utils.logging import logger
+from utils.logger_utils import log
 
 
-def retry_connection(max_retries=3, delay=1):
+def retry_connection(max_retries=3, delay=1, backoff=2, max_delay=30):
     """
     A decorator that retries connecting to the API in case of connection issues.
 
+    The delay between attempts grows exponentially: delay, delay * backoff,
+    delay * backoff ** 2, ..., capped at max_delay seconds.
+
     :param max_retries: Maximum number of retry attempts.
-    :param delay: Time in seconds between each retry attempt.
+    :param delay: Time in seconds before the first retry attempt.
+    :param backoff: Multiplier applied to the delay after each failed attempt.
+    :param max_delay: Maximum time in seconds between retry attempts.
     """
 
     def retry_connection_decorator(func):
+        @functools.wraps(func)
         def retry_connection_wrapper(*args, **kwargs):
             retries = 0
+            retry_delay = delay
             while retries < max_retries:
                 try:
                     return func(*args, **kwargs)
@@ -28,12 +36,14 @@ def retry_connection(max_retries=3, delay=1):
                     OSError,
                 ) as e:
                     retries += 1
-                    logger.warning(
-                        f"retry_connection Connection failed (attempt {retries}/{max_retries}). Retrying in {delay} seconds..."
+                    log(
+                        f"retry_connection Connection failed (attempt {retries}/{max_retries}): {e}. "
+                        f"Retrying in {retry_delay} seconds..."
                     )
-                    time.sleep(delay)
+                    time.sleep(retry_delay)
+                    retry_delay = min(retry_delay * backoff, max_delay)
             error_msg = f"retry_connection. Max retries reached. Connection failed. max_retries: {max_retries}, delay: {delay}"
-            logger.error(error_msg)
+            log(error_msg)
             raise Exception(error_msg)
 
         return retry_connection_wrapper
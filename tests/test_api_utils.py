@@ -1,13 +1,25 @@
 import pytest
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from utils.api_utils import (
+    Klines,
+    KLINES_CACHE_DTYPES,
+    klines_to_df,
     create_binance_client,
     get_klines,
     get_full_historical_klines,
+    get_cached_historical_klines,
+    parse_lookback,
+    wait_for_request_weight,
 )
+from utils.cache_utils import get_klines_cache_path, load_cached_klines
 
 
 @patch("os.environ.get")
@@ -23,8 +35,46 @@ def test_create_binance_client(mock_get):
     assert client is None
 
 
+@patch("utils.api_utils.Client")
+@patch("os.environ.get")
+def test_create_binance_client_reuses_client(mock_get, mock_client_class):
+    mock_get.side_effect = lambda key: (
+        "cached_key" if key == "BINANCE_GENERAL_API_KEY" else "cached_secret"
+    )
+    first_client = create_binance_client()
+    second_client = create_binance_client()
+    assert first_client is second_client
+    mock_client_class.assert_called_once_with("cached_key", "cached_secret")
+
+
+@patch("utils.api_utils.Client")
+@patch("os.environ.get")
+def test_create_binance_client_concurrent_calls(mock_get, mock_client_class):
+    mock_get.side_effect = lambda key: (
+        "concurrent_key" if key == "BINANCE_GENERAL_API_KEY" else "concurrent_secret"
+    )
+    mock_client_class.side_effect = lambda *args: time.sleep(0.05) or MagicMock()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        clients = list(executor.map(lambda _: create_binance_client(), range(4)))
+
+    assert all(client is clients[0] for client in clients)
+    mock_client_class.assert_called_once_with("concurrent_key", "concurrent_secret")
+
+
+def test_parse_lookback():
+    assert parse_lookback("10h") == timedelta(hours=10)
+    assert parse_lookback("9d") == timedelta(days=9)
+    assert parse_lookback("30m") == timedelta(minutes=30)
+
+    for lookback in ["10x", "h", "1.5d", "d10"]:
+        with pytest.raises(ValueError):
+            parse_lookback(lookback)
+
+
 @patch("utils.api_utils.create_binance_client")
-def test_get_klines(mock_create_client):
+@patch("time.sleep", return_value=None)
+def test_get_klines(mock_sleep, mock_create_client):
     mock_client = MagicMock()
     mock_create_client.return_value = mock_client
 
@@ -50,39 +100,52 @@ def test_get_klines(mock_create_client):
     assert not df.empty
     assert "close" in df.columns
     assert df["close"].iloc[0] == 47500.0
+    start_str = mock_client.get_historical_klines.call_args.kwargs["start_str"]
+    assert isinstance(start_str, int)
 
-    with pytest.raises(ValueError):
-        get_klines(symbol="BTCUSDC", interval="1h", lookback="1x")
+    klines = get_klines(symbol="BTCUSDC", interval="1h", lookback="1d", raw=True)
+    assert isinstance(klines, Klines)
+    assert klines.open_time.dtype == np.int64
+    assert klines.close.dtype == np.float32
+    assert klines.close[0] == 47500.0
 
-    mock_client.get_historical_klines.side_effect = BinanceAPIException(None, "Error")
+    assert get_klines(symbol="BTCUSDC", interval="1h", lookback="1x") is None
+
+    mock_client.get_historical_klines.side_effect = make_binance_api_exception()
     df = get_klines(symbol="BTCUSDC", interval="1h", lookback="1d")
     assert df is None
 
 
+def make_kline(open_time):
+    return [
+        open_time,
+        "47000",
+        "48000",
+        "46000",
+        "47500",
+        "1000",
+        open_time + 3599999,
+        "47500000",
+        100,
+        "500",
+        "47500",
+        "0",
+    ]
+
+
+def make_binance_api_exception():
+    response = MagicMock()
+    response.text = '{"code": -1003, "msg": "Error"}'
+    return BinanceAPIException(response, 429, response.text)
+
+
 @patch("utils.api_utils.create_binance_client")
 @patch("time.sleep", return_value=None)
 def test_get_full_historical_klines(mock_sleep, mock_create_client):
     mock_client = MagicMock()
     mock_create_client.return_value = mock_client
-
-    mock_client.get_historical_klines.side_effect = [
-        [
-            [
-                1640995200000,
-                "47000",
-                "48000",
-                "46000",
-                "47500",
-                "1000",
-                1640998800000,
-                "47500000",
-                100,
-                "500",
-                "47500",
-                "0",
-            ]
-        ],
-        [],
+    mock_client.get_klines.side_effect = lambda **kwargs: [
+        make_kline(kwargs["startTime"])
     ]
 
     df = get_full_historical_klines(
@@ -92,14 +155,149 @@ def test_get_full_historical_klines(mock_sleep, mock_create_client):
     assert not df.empty
     assert "close" in df.columns
     assert df["close"].iloc[0] == 47500.0
+    window_calls = mock_client.get_klines.call_args_list[1:]
+    assert all(call.kwargs["limit"] == 1000 for call in window_calls)
+    window_starts = sorted(call.kwargs["startTime"] for call in window_calls)
+    assert window_starts[0] == 1640995200000
+    assert df["open_time"].tolist() == window_starts
+    assert df["open_time"].is_monotonic_increasing
+    assert df["open_time"].is_unique
 
-    mock_client.get_historical_klines.side_effect = BinanceAPIException(None, "Error")
+    mock_client.get_klines.side_effect = make_binance_api_exception()
     df = get_full_historical_klines(
         symbol="BTCUSDC", interval="1h", start_str="1 Jan, 2022"
     )
     assert df is None
 
-    with pytest.raises(ValueError):
+    assert (
         get_full_historical_klines(
             symbol="BTCUSDC", interval="1h", start_str="Invalid date"
         )
+        is None
+    )
+
+
+@patch("utils.api_utils.create_binance_client")
+@patch("time.sleep", return_value=None)
+def test_get_full_historical_klines_checkpoints_fetched_windows(
+    mock_sleep, mock_create_client, tmp_path
+):
+    mock_client = MagicMock()
+    mock_create_client.return_value = mock_client
+    window_ms = 1000 * 3600000
+    start_time = int(time.time() * 1000) - 3 * window_ms + window_ms // 2
+    window_starts = list(range(start_time, int(time.time() * 1000), window_ms))
+
+    def get_klines(**kwargs):
+        if kwargs["startTime"] == window_starts[-1] and "endTime" in kwargs:
+            raise make_binance_api_exception()
+        return [make_kline(kwargs["startTime"])]
+
+    mock_client.get_klines.side_effect = get_klines
+
+    df = get_full_historical_klines(
+        symbol="BTCUSDC", interval="1h", start_str=start_time, cache_dir=tmp_path
+    )
+    assert df is None
+    cached_klines = load_cached_klines("BTCUSDC", "1h", tmp_path)
+    assert cached_klines["open_time"].tolist() == window_starts[:-1]
+
+
+HOUR_MS = 3600000
+YEAR_2023_MS = 1672531200000
+YEAR_2024_MS = 1704067200000
+EXCHANGE_OPEN_TIMES = [
+    YEAR_2023_MS - 2 * HOUR_MS,
+    YEAR_2023_MS - HOUR_MS,
+    YEAR_2023_MS,
+    YEAR_2023_MS + HOUR_MS,
+    YEAR_2024_MS,
+    YEAR_2024_MS + HOUR_MS,
+]
+
+
+def fetch_exchange_klines(start_str, end_str=None, **kwargs):
+    open_times = [
+        open_time
+        for open_time in EXCHANGE_OPEN_TIMES
+        if open_time >= start_str and (end_str is None or open_time < end_str)
+    ]
+    klines = [make_kline(open_time) for open_time in open_times]
+    for kline in klines:
+        kline[4] = "97123.45"
+    return klines_to_df(klines, KLINES_CACHE_DTYPES)
+
+
+@patch("utils.api_utils.get_full_historical_klines")
+def test_get_cached_historical_klines(mock_get_full, tmp_path):
+    mock_get_full.side_effect = fetch_exchange_klines
+
+    df = get_cached_historical_klines(
+        symbol="BTCUSDC", interval="1h", start_str="1 Jan, 2023", cache_dir=tmp_path
+    )
+    assert mock_get_full.call_args.kwargs["start_str"] == YEAR_2023_MS
+    assert df["open_time"].tolist() == EXCHANGE_OPEN_TIMES[2:]
+    assert df["close"].dtype == np.float32
+    cached_klines = load_cached_klines("BTCUSDC", "1h", tmp_path)
+    assert cached_klines["close"].dtype == np.float64
+    assert (cached_klines["close"] == 97123.45).all()
+
+    mock_get_full.reset_mock()
+    df = get_cached_historical_klines(
+        symbol="BTCUSDC",
+        interval="1h",
+        start_str=EXCHANGE_OPEN_TIMES[0],
+        cache_dir=tmp_path,
+    )
+    fetched_ranges = [
+        (call.kwargs["start_str"], call.kwargs["end_str"])
+        for call in mock_get_full.call_args_list
+    ]
+    assert fetched_ranges == [
+        (EXCHANGE_OPEN_TIMES[0], YEAR_2023_MS),
+        (YEAR_2023_MS + 2 * HOUR_MS, YEAR_2024_MS),
+        (YEAR_2024_MS + HOUR_MS, None),
+    ]
+    assert df["open_time"].tolist() == EXCHANGE_OPEN_TIMES
+
+    cache_path = get_klines_cache_path("BTCUSDC", "1h", tmp_path)
+    shutil.rmtree(cache_path / "year=2023")
+    mock_get_full.reset_mock()
+    df = get_cached_historical_klines(
+        symbol="BTCUSDC",
+        interval="1h",
+        start_str=EXCHANGE_OPEN_TIMES[0],
+        cache_dir=tmp_path,
+    )
+    assert (YEAR_2023_MS, YEAR_2024_MS) in [
+        (call.kwargs["start_str"], call.kwargs["end_str"])
+        for call in mock_get_full.call_args_list
+    ]
+    assert df["open_time"].tolist() == EXCHANGE_OPEN_TIMES
+    cached_klines = load_cached_klines("BTCUSDC", "1h", tmp_path)
+    assert cached_klines["open_time"].tolist() == EXCHANGE_OPEN_TIMES
+
+    mock_get_full.side_effect = None
+    mock_get_full.return_value = None
+    df = get_cached_historical_klines(
+        symbol="BTCUSDC", interval="1h", start_str="1 Jan, 2024", cache_dir=tmp_path
+    )
+    assert df["open_time"].tolist() == EXCHANGE_OPEN_TIMES[4:]
+
+
+@patch("utils.api_utils.log")
+@patch("time.sleep", return_value=None)
+def test_wait_for_request_weight(mock_sleep, mock_log):
+    mock_client = MagicMock()
+
+    mock_client.response.headers = {"x-mbx-used-weight-1m": "10"}
+    wait_for_request_weight(mock_client)
+    mock_sleep.assert_not_called()
+
+    mock_client.response.headers = {"x-mbx-used-weight-1m": "1150"}
+    wait_for_request_weight(mock_client)
+    mock_sleep.assert_called_once()
+
+    mock_client.response.headers = {"x-mbx-used-weight-1m": "20"}
+    wait_for_request_weight(mock_client)
+    mock_sleep.assert_called_once()
@@ -3,8 +3,8 @@ import json
 import pandas as pd
 import pytest
 from utils.app_utils import (
-    save_data_to_csv,
-    load_data_from_csv,
+    save_data,
+    load_data,
     save_df_info,
     extract_settings_data,
     save_dataframe_with_info,
@@ -35,25 +35,42 @@ def temp_json_file(tmp_path):
     return path
 
 
-def test_save_data_to_csv(sample_dataframe, temp_csv_file):
-    save_data_to_csv(sample_dataframe, temp_csv_file)
+def test_save_data(sample_dataframe, temp_csv_file):
+    save_data(sample_dataframe, temp_csv_file)
     assert os.path.exists(temp_csv_file)
     loaded_df = pd.read_csv(temp_csv_file)
     pd.testing.assert_frame_equal(sample_dataframe, loaded_df)
 
 
-def test_save_data_to_csv_none():
-    assert save_data_to_csv(None, "test.csv") is None
+def test_save_data_none():
+    assert save_data(None, "test.csv") is None
 
 
-def test_load_data_from_csv(sample_dataframe, temp_csv_file):
+def test_load_data(sample_dataframe, temp_csv_file):
     sample_dataframe.to_csv(temp_csv_file, index=False)
-    loaded_df = load_data_from_csv(temp_csv_file)
+    loaded_df = load_data(temp_csv_file)
     pd.testing.assert_frame_equal(sample_dataframe, loaded_df)
 
 
-def test_load_data_from_csv_invalid():
-    assert load_data_from_csv("nonexistent.csv") is None
+def test_save_and_load_data_parquet(sample_dataframe, tmp_path):
+    parquet_file = tmp_path / "test.parquet"
+    save_data(sample_dataframe, parquet_file)
+    assert os.path.exists(parquet_file)
+    loaded_df = load_data(parquet_file)
+    pd.testing.assert_frame_equal(sample_dataframe, loaded_df)
+
+
+def test_load_data_dtype(sample_dataframe, tmp_path):
+    dtype = {column: "float32" for column in sample_dataframe.columns}
+    dtype["missing"] = "float32"
+    for filename in (tmp_path / "test.csv", tmp_path / "test.parquet"):
+        save_data(sample_dataframe, filename)
+        loaded_df = load_data(filename, dtype=dtype)
+        assert (loaded_df.dtypes == "float32").all()
+
+
+def test_load_data_invalid():
+    assert load_data("nonexistent.csv") is None
 
 
 def test_save_df_info(sample_dataframe, temp_info_file):
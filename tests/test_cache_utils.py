@@ -0,0 +1,91 @@
+import os
+import pandas as pd
+import pytest
+from utils.cache_utils import (
+    get_klines_cache_path,
+    load_cached_klines,
+    save_klines_to_cache,
+    get_df_cache_key,
+    load_cached_df,
+    save_df_to_cache,
+)
+
+
+@pytest.fixture
+def sample_klines():
+    return pd.DataFrame(
+        {
+            "open_time": [1703980800000, 1703984400000, 1704067200000],
+            "open": [47000.0, 47500.0, 48000.0],
+            "close": [47500.0, 48000.0, 48500.0],
+            "close_time": [1703984399999, 1703987999999, 1704070799999],
+        }
+    )
+
+
+def test_save_and_load_cached_klines(sample_klines, tmp_path):
+    save_klines_to_cache(sample_klines, "BTCUSDC", "1h", tmp_path)
+
+    cache_path = get_klines_cache_path("BTCUSDC", "1h", tmp_path)
+    assert (cache_path / "year=2023").is_dir()
+    assert (cache_path / "year=2024").is_dir()
+
+    df = load_cached_klines("BTCUSDC", "1h", tmp_path)
+    pd.testing.assert_frame_equal(df, sample_klines)
+
+
+def test_save_klines_to_cache_replaces_partitions(sample_klines, tmp_path):
+    save_klines_to_cache(sample_klines, "BTCUSDC", "1h", tmp_path)
+    save_klines_to_cache(sample_klines.iloc[2:], "BTCUSDC", "1h", tmp_path)
+
+    df = load_cached_klines("BTCUSDC", "1h", tmp_path)
+    assert df["open_time"].tolist() == sample_klines["open_time"].tolist()
+
+
+def test_load_cached_klines_missing(tmp_path):
+    assert load_cached_klines("BTCUSDC", "1h", tmp_path) is None
+
+
+def test_get_df_cache_key(tmp_path):
+    data_file = tmp_path / "data.csv"
+    data_file.write_text("open_time,close\n1,2\n")
+    settings = {"general_timeperiod": 14, "lag_period": 3}
+
+    key = get_df_cache_key(data_file, settings)
+    assert key == get_df_cache_key(data_file, dict(reversed(settings.items())))
+    assert key != get_df_cache_key(data_file, {**settings, "lag_period": 4})
+    assert key != get_df_cache_key(data_file, settings, "v2")
+
+    data_file.write_text("open_time,close\n1,3\n")
+    assert key != get_df_cache_key(data_file, settings)
+
+    settings_keys = ["general_timeperiod", "lag_period"]
+    key = get_df_cache_key(data_file, settings, settings_keys=settings_keys)
+    assert key == get_df_cache_key(
+        data_file, {**settings, "batch_size": 64}, settings_keys=settings_keys
+    )
+    assert key != get_df_cache_key(
+        data_file, {**settings, "lag_period": 4}, settings_keys=settings_keys
+    )
+
+    assert get_df_cache_key(tmp_path / "missing.csv", settings) is None
+
+
+def test_save_and_load_cached_df(sample_klines, tmp_path):
+    assert load_cached_df("key", tmp_path) is None
+
+    save_df_to_cache(sample_klines, "key", tmp_path)
+    pd.testing.assert_frame_equal(load_cached_df("key", tmp_path), sample_klines)
+
+
+def test_save_df_to_cache_prunes_old_entries(sample_klines, tmp_path):
+    for i in range(3):
+        save_df_to_cache(sample_klines, f"key{i}", tmp_path, max_entries=2)
+        os.utime(tmp_path / f"key{i}.parquet", (i, i))
+
+    save_df_to_cache(sample_klines, "key3", tmp_path, max_entries=2)
+
+    assert sorted(path.name for path in tmp_path.glob("*.parquet")) == [
+        "key2.parquet",
+        "key3.parquet",
+    ]
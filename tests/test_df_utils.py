@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from utils.df_utils import (
+    add_ml_classification_etiquete,
+    calculate_ml_time_patterns,
+    find_ml_bullish_engulfing_patterns,
+    find_ml_hammer_patterns,
+    find_ml_morning_star_patterns,
+    handle_final_ml_df_cleaninig,
+)
+
+
+def test_calculate_ml_time_patterns():
+    rng = np.random.default_rng(0)
+    close_time = np.concatenate(
+        [
+            rng.integers(0, 2_000_000_000_000, 1000),
+            [0, 951868799999, 951868800000, 1704067199999, 1709251199999],
+        ]
+    )
+    df = calculate_ml_time_patterns(pd.DataFrame({"close_time": close_time}))
+
+    expected = pd.to_datetime(pd.Series(close_time), unit="ms").dt
+    np.testing.assert_array_equal(df["close_time_hour"], expected.hour)
+    np.testing.assert_array_equal(df["close_time_weekday"], expected.weekday)
+    np.testing.assert_array_equal(df["close_time_month"], expected.month)
+    np.testing.assert_allclose(df["hour_sin"], np.sin(2 * np.pi * expected.hour / 24))
+    np.testing.assert_allclose(
+        df["weekday_cos"], np.cos(2 * np.pi * expected.weekday / 7)
+    )
+    np.testing.assert_allclose(df["month_sin"], np.sin(2 * np.pi * expected.month / 12))
+    np.testing.assert_array_equal(df["is_weekend"], expected.weekday >= 5)
+    np.testing.assert_array_equal(
+        df["is_morning"], (expected.hour >= 9) & (expected.hour <= 12)
+    )
+    assert df["close_time"].tolist() == close_time.tolist()
+
+
+def test_find_ml_candlestick_patterns():
+    df = pd.DataFrame(
+        {
+            "open": [105.0, 99.0, 100.0, 108.0, 103.0],
+            "high": [106.0, 102.0, 108.0, 109.0, 110.0],
+            "low": [99.0, 98.0, 99.0, 103.0, 102.0],
+            "close": [100.0, 101.0, 107.0, 104.0, 109.0],
+            "is_morning": [True, True, True, False, True],
+            "is_weekend": [False, False, True, False, False],
+        }
+    )
+
+    df = find_ml_hammer_patterns(df)
+    df = find_ml_morning_star_patterns(df)
+    df = find_ml_bullish_engulfing_patterns(df)
+
+    assert not df["hammer"].any()
+    assert df["morning_star"].tolist() == [False, False, True, False, False]
+    assert df["is_morning_star_morning"].tolist() == [False, False, True, False, False]
+    assert df["is_morning_star_weekend"].tolist() == [False, False, True, False, False]
+    assert df["bullish_engulfing"].tolist() == [False, False, False, False, True]
+    assert df["is_bullish_engulfing_morning"].tolist() == [
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert not df["is_bullish_engulfing_weekend"].any()
+
+
+def test_handle_final_ml_df_cleaninig():
+    df = pd.DataFrame(
+        {
+            "close": [1.0, np.nan, np.inf],
+            "rsi_14": np.array([np.nan, 2.0, 3.0], dtype=np.float32),
+            "hammer": [True, False, True],
+            "close_time_hour": np.array([1, 2, 3], dtype=np.int8),
+            "open_time": [1, 2, 3],
+        }
+    )
+
+    df = handle_final_ml_df_cleaninig(df, ["open_time"])
+
+    assert list(df.columns) == ["close", "rsi_14", "hammer", "close_time_hour"]
+    assert df["close"].dtype == np.float64
+    assert df["rsi_14"].dtype == np.float32
+    assert df["hammer"].dtype == np.uint8
+    assert df["close_time_hour"].dtype == np.int8
+    assert df["close"].tolist() == [1.0, 0.0, np.inf]
+    assert df["rsi_14"].tolist() == [0.0, 2.0, 3.0]
+    assert df["hammer"].tolist() == [1, 0, 1]
+
+
+def test_add_ml_classification_etiquete():
+    df = pd.DataFrame({"close": [100.0, 102.0, 99.0, 105.0, 104.0]})
+
+    df = add_ml_classification_etiquete(
+        df, marker_period=2, success_threshold=2, drop_threshold=-2
+    )
+
+    assert list(df.columns) == ["close", "marker_close_trade_success_in_next_2_periods"]
+    assert df["marker_close_trade_success_in_next_2_periods"].tolist() == [
+        True,
+        False,
+        True,
+        False,
+        False,
+    ]
@@ -14,10 +14,10 @@ def mock_dependencies():
     ) as mock_log, patch(
         "utils.app_utils.extract_settings_data"
     ) as mock_extract_settings_data, patch(
-        "utils.app_utils.load_data_from_csv"
-    ) as mock_load_data_from_csv, patch(
-        "utils.app_utils.save_data_to_csv"
-    ) as mock_save_data_to_csv, patch(
+        "utils.app_utils.load_data"
+    ) as mock_load_data, patch(
+        "utils.app_utils.save_data"
+    ) as mock_save_data, patch(
         "utils.app_utils.save_df_info"
     ) as mock_save_df_info, patch(
         "utils.calc_utils.prepare_df"
@@ -32,8 +32,8 @@ def mock_dependencies():
         mock_extract_settings_data.return_value = {
             "settings": {"regresion": True, "clasification": False}
         }
-        mock_load_data_from_csv.return_value = MagicMock()
-        mock_save_data_to_csv.return_value = None
+        mock_load_data.return_value = MagicMock()
+        mock_save_data.return_value = None
         mock_save_df_info.return_value = None
         mock_prepare_df.return_value = MagicMock()
 
@@ -42,8 +42,8 @@ def mock_dependencies():
             "mock_initialize_logger": mock_initialize_logger,
             "mock_log": mock_log,
             "mock_extract_settings_data": mock_extract_settings_data,
-            "mock_load_data_from_csv": mock_load_data_from_csv,
-            "mock_save_data_to_csv": mock_save_data_to_csv,
+            "mock_load_data": mock_load_data,
+            "mock_save_data": mock_save_data,
             "mock_save_df_info": mock_save_df_info,
             "mock_prepare_df": mock_prepare_df,
         }
@@ -66,17 +66,17 @@ def test_mariola_calc(mock_dependencies):
         "settings_filename.json"
     )
 
-    mock_dependencies["mock_load_data_from_csv"].assert_called_with("data_filename.csv")
+    mock_dependencies["mock_load_data"].assert_called_with("data_filename.csv")
 
     mock_dependencies["mock_prepare_df"].assert_called_with(
-        df=mock_dependencies["mock_load_data_from_csv"](),
+        df=mock_dependencies["mock_load_data"](),
         regresion=True,
         clasification=False,
         settings=mock_dependencies["mock_extract_settings_data"]()["settings"],
         training_mode=True,
     )
 
-    mock_dependencies["mock_save_data_to_csv"].assert_called_with(
+    mock_dependencies["mock_save_data"].assert_called_with(
         mock_dependencies["mock_prepare_df"](), "data_filename_calculated"
     )
     mock_dependencies["mock_save_df_info"].assert_called_with(
@@ -7,11 +7,11 @@ from mariola.fetch_data import fetch_data
 @patch("utils.app_utils.extract_settings_data")
 @patch("utils.parser_utils.get_parsed_arguments")
 @patch("utils.api_utils.get_full_historical_klines")
-@patch("utils.app_utils.save_data_to_csv")
+@patch("utils.app_utils.save_data")
 @patch("utils.app_utils.save_df_info")
 def test_fetch_data_full_flow(
     mock_save_df_info,
-    mock_save_data_to_csv,
+    mock_save_data,
     mock_get_full_historical_klines,
     mock_get_parsed_arguments,
     mock_extract_settings_data,
@@ -46,7 +46,7 @@ def test_fetch_data_full_flow(
     mock_get_full_historical_klines.assert_called_once_with(
         symbol="BTCUSDT", interval="1m", start_str="1 day ago UTC"
     )
-    mock_save_data_to_csv.assert_called_once_with(
+    mock_save_data.assert_called_once_with(
         [["fake", "data"]], "data/df_step_1_fetched.csv"
     )
     mock_save_df_info.assert_called_once_with(
@@ -12,7 +12,7 @@ def mock_dependencies():
     ) as mock_log, mock.patch(
         "mariola_train.extract_settings_data"
     ) as mock_extract_settings, mock.patch(
-        "mariola_train.load_data_from_csv"
+        "mariola_train.load_data"
     ) as mock_load_data, mock.patch(
         "mariola_train.normalize_df"
     ) as mock_normalize, mock.patch(
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.ml_utils import (
+    normalize_df,
+    handle_pca,
+    create_sequences,
+    create_scaler,
+    create_pca,
+    is_fitted,
+    save_preprocessors,
+    load_preprocessors,
+)
+
+
+@pytest.fixture
+def sample_features():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((120, 60)), columns=[f"f{i}" for i in range(60)])
+    df["marker"] = np.arange(120) % 2
+    return df
+
+
+def test_create_sequences():
+    df_reduced = pd.DataFrame(
+        {
+            "pca1": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+            "pca2": [0.9, 0.8, 0.7, 0.6, 0.5, 0.4],
+            "marker": [1, 0, 1, 0, 1, 0],
+        }
+    )
+
+    X, y = create_sequences(
+        df_reduced=df_reduced,
+        lookback=1,
+        window_size=2,
+        result_marker="marker",
+        training_mode=True,
+    )
+
+    assert X.shape == (3, 2, 2)
+    assert X.dtype == np.float32
+    np.testing.assert_array_equal(X[1], np.float32([[0.2, 0.8], [0.3, 0.7]]))
+    np.testing.assert_array_equal(y, [0, 1, 0])
+
+    X = create_sequences(
+        df_reduced=df_reduced.drop(columns=["marker"]),
+        lookback=1,
+        window_size=2,
+        result_marker="marker",
+        training_mode=False,
+    )
+
+    assert isinstance(X, np.ndarray)
+    assert X.shape == (3, 2, 2)
+
+
+def test_preprocessors_round_trip(sample_features, tmp_path):
+    scaler = create_scaler()
+    pca = create_pca()
+    df_normalized = normalize_df(sample_features, result_marker="marker", scaler=scaler)
+    df_reduced = handle_pca(df_normalized, sample_features, "marker", pca=pca)
+    assert is_fitted(scaler) and is_fitted(pca)
+    assert df_reduced.shape == (120, 51)
+
+    filename = tmp_path / "preprocessors.joblib"
+    save_preprocessors(scaler, pca, filename)
+    loaded_scaler, loaded_pca = load_preprocessors(filename)
+
+    df_new = sample_features.drop(columns=["marker"])
+    df_new_normalized = normalize_df(
+        df_new, training_mode=False, scaler=loaded_scaler
+    )
+    df_new_reduced = handle_pca(df_new_normalized, df_new, None, pca=loaded_pca)
+
+    np.testing.assert_allclose(
+        df_new_reduced.to_numpy(),
+        df_reduced.drop(columns=["marker"]).to_numpy(),
+        atol=1e-5,
+    )
+
+
+def test_normalize_df_excludes_all_markers(sample_features):
+    df = sample_features.assign(marker_other=np.arange(120) % 3)
+    scaler = create_scaler()
+    df_normalized = normalize_df(df, result_marker="marker", scaler=scaler)
+
+    assert scaler.n_features_in_ == 60
+    assert "marker_other" not in df_normalized.columns
+
+    df_new = sample_features.drop(columns=["marker"])
+    assert normalize_df(df_new, training_mode=False, scaler=scaler) is not None
+    assert (
+        normalize_df(df_new.iloc[:, :-1], training_mode=False, scaler=scaler) is None
+    )
+
+
+def test_load_preprocessors_missing_file(tmp_path):
+    assert load_preprocessors(tmp_path / "missing.joblib") is None
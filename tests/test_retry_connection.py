@@ -0,0 +1,24 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from utils.retry_connection import retry_connection
+
+
+@patch("time.sleep", return_value=None)
+def test_retry_connection_exponential_backoff(mock_sleep):
+    func = MagicMock(side_effect=[ConnectionError(), TimeoutError(), "ok"])
+    wrapped = retry_connection(max_retries=5, delay=1, backoff=2)(func)
+
+    assert wrapped() == "ok"
+    assert func.call_count == 3
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2]
+
+
+@patch("time.sleep", return_value=None)
+def test_retry_connection_max_delay_and_max_retries(mock_sleep):
+    func = MagicMock(side_effect=ConnectionError())
+    wrapped = retry_connection(max_retries=4, delay=10, backoff=2, max_delay=30)(func)
+
+    with pytest.raises(Exception, match="Max retries reached"):
+        wrapped()
+    assert func.call_count == 4
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [10, 20, 30, 30]